@@ -0,0 +1,186 @@
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+# No background work (warm-up, prefetch, file watcher) while a slide is being measured
+os.environ["DECK_PREFETCH"] = "0"
+os.environ["DECK_WARMUP"] = "0"
+os.environ["DECK_WATCH"] = "0"
+# Cold means parsing the CSVs unless asked otherwise (DECK_DISK_CACHE=1
+# measures a restart with a filled on-disk cache)
+os.environ.setdefault("DECK_DISK_CACHE", "0")
+# ...and building the SQLite tables, in a database of its own that cold runs
+# can empty without touching the app's
+if "DECK_DB" not in os.environ:
+    _db_dir = tempfile.mkdtemp(prefix="deck-bench-")
+    atexit.register(shutil.rmtree, _db_dir, ignore_errors=True)
+    os.environ["DECK_DB"] = os.path.join(_db_dir, "deck.sqlite")
+
+from streamlit.testing.v1 import AppTest
+
+import countrycube
+import database
+import datasets
+import figcache
+# Imported here, with plotly and pandas behind it, so the first slide's cold
+# numbers aren't mostly importing what every slide draws with. Each slide's
+# own imports (its module, matplotlib for s8, ...) are still part of its cold
+# run.
+import figures  # noqa: F401
+import jobindex
+import metrics
+import slides
+import timing
+
+# Headless benchmark of every slide in groupapp.py, driven through the slide
+# dispatch with Streamlit's app-testing interface.
+#
+#   python bench.py                      # 5 warm runs per slide
+#   python bench.py --runs 20 --out results.json
+#   python bench.py --memory 5000        # RSS over 5000 reruns of s8 instead
+#
+# For each slide:
+#   cold  first rerun with the dataset and figure caches, the SQLite tables
+#         and the indexes built from them emptied
+#   warm  median of the following reruns on the same session
+# and for both, the self time of each stage (import, load, clean, figure,
+# serialize; see timing.py), which don't overlap, next to the wall time of
+# the whole rerun. Results are written as
+# JSON, tagged with the current commit, so runs can be diffed across commits.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "groupapp.py")
+STAGES = ("import", "load", "clean", "figure", "serialize")
+
+# --memory reruns the chart switch of this slide
+MEMORY_SLIDE = "Annual Industrial Robots Installed"
+MEMORY_RADIO = "Choose a chart:"
+
+
+def slide_titles():
+    return [slide.title for slide in slides.registry()]
+
+
+def timed_run(at):
+    timing.reset()
+    start = time.perf_counter()
+    at.run()
+    wall = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    totals = timing.totals()
+    result = {"wall_ms": wall}
+    for name in STAGES:
+        # Self time: the stages nest, their wall times would overlap
+        result[name + "_ms"] = totals.get(name, {}).get("self_ms", 0.0)
+    return result
+
+
+def bench_slide(title, runs):
+    datasets.clear()
+    figcache.clear()
+    database.clear()
+    jobindex.clear()
+    countrycube.clear()
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["current_slide"] = title
+    cold = timed_run(at)
+    warm_runs = [timed_run(at) for _ in range(runs)]
+    warm = {key: statistics.median(run[key] for run in warm_runs) for key in cold}
+    return {"cold": cold, "warm": warm}
+
+
+def memory_check(reruns, max_growth_mb, samples=20):
+    # Flip s8's chart back and forth `reruns` times and watch the process RSS.
+    # The first tenth of the reruns is warm-up (caches, allocator pools); after
+    # that memory should stay flat.
+
+    # Only imported here: at module level it would take matplotlib's import
+    # out of the s8 cold run
+    import matplotlib.pyplot as plt
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["current_slide"] = MEMORY_SLIDE
+    at.run()
+
+    every = max(1, reruns // samples)
+    rss = []
+    for i in range(reruns):
+        radio = next(r for r in at.radio if r.label == MEMORY_RADIO)
+        radio.set_value(radio.options[i % len(radio.options)]).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        if (i + 1) % every == 0:
+            rss.append((i + 1, metrics.rss_bytes() / 1024 / 1024))
+            print(f"{i + 1:>8} reruns  {rss[-1][1]:8.1f} MB")
+
+    settled = [mb for i, mb in rss if i > reruns // 10]
+    growth = settled[-1] - settled[0] if settled else 0.0
+    result = {
+        "reruns": reruns,
+        "rss_mb": rss,
+        "growth_after_warmup_mb": growth,
+        "open_pyplot_figures": len(plt.get_fignums()),
+        "flat": growth <= max_growth_mb,
+    }
+    print(f"RSS growth after warm-up: {growth:.1f} MB, open pyplot figures: {result['open_pyplot_figures']}")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(APP), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every slide of groupapp.py")
+    parser.add_argument("--runs", type=int, default=5, help="warm reruns per slide")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--memory", type=int, metavar="RERUNS", help="only check that RSS stays flat over this many reruns")
+    parser.add_argument("--max-growth-mb", type=float, default=10.0, help="RSS growth --memory tolerates")
+    args = parser.parse_args()
+
+    if args.memory:
+        result = memory_check(args.memory, args.max_growth_mb)
+        result["commit"] = git_commit()
+        with open(args.out, "w") as f:
+            json.dump({"memory": result}, f, indent=2)
+        print(f"wrote {args.out}")
+        raise SystemExit(0 if result["flat"] else 1)
+
+    titles = slide_titles()
+
+    results = {}
+    for title in titles:
+        results[title] = bench_slide(title, args.runs)
+        cold, warm = results[title]["cold"], results[title]["warm"]
+        print(f"{title:<40} cold {cold['wall_ms']:8.1f} ms   warm {warm['wall_ms']:8.1f} ms")
+        for name in STAGES:
+            print(f"    {name:<10} cold {cold[name + '_ms']:8.1f} ms   warm {warm[name + '_ms']:8.1f} ms")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "slides": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import threading
+
+import pandas as pd
+
+import database
+import datasets
+import timing
+
+# Country x year cube behind s2's per-person and relative-to-GDP maps. It puts
+# AI patents, private investment and robot installations for each (Year,
+# Code) next to the country's population and GDP from world-data-2023.csv,
+# plus the ratios derived from them, so a map is one index lookup into an
+# already joined frame instead of merging four datasets on every request.
+#
+# The OWID datasets key countries by ISO3 Code; world-data-2023.csv only has a
+# country name and an ISO2 Abbreviation (missing or repeated for some rows),
+# so the country-code index matches its names to the OWID Entity of each
+# Code, with ALIASES for the few names the two spell differently. Countries
+# without a match get no population/GDP, and so no ratios.
+#
+# world-data-2023.csv is a single snapshot: every year is scaled by the
+# 2023 population and GDP. The cube is built once per version of its
+# datasets (see get) and holds a few thousand rows.
+
+# cube column -> (dataset, value column), same datasets as s2's radio
+SOURCES = {
+    "patents": ("patents", 'Patent applications per 1 million people - Field: All'),
+    "investment": ("investment", 'Estimated investment - Field: All'),
+    "robots": ("robots", 'Annual industrial robots installed'),
+}
+DATASETS = tuple(name for name, _ in SOURCES.values()) + ("world",)
+
+# OWID Entity -> world-data-2023 Country
+ALIASES = {
+    "Cote d'Ivoire": "Ivory Coast",
+    "Czechia": "Czech Republic",
+    "Ireland": "Republic of Ireland",
+}
+
+# Derived column -> what its values are, for titles and color bars
+UNITS = {
+    "patents_per_capita": "Patent applications per million people",
+    "patents_per_gdp": "Patent applications per $1B of GDP",
+    "investment_per_capita": "Private AI investment per person (USD)",
+    "investment_per_gdp": "Private AI investment (% of GDP)",
+    "robots_per_capita": "Robots installed per million people",
+    "robots_per_gdp": "Robots installed per $1B of GDP",
+}
+
+# ISO3 codes only: regional aggregates have no Code or an OWID_ one (e.g. World)
+REAL_CODES = '"Code" IS NOT NULL AND substr("Code", 1, 5) != \'OWID_\''
+
+_lock = threading.Lock()
+_cubes = {}
+
+
+############################################################################################################################################################################
+def country_codes():
+    # ISO3 Code -> Country, Abbreviation, Population, GDP for every country in
+    # SOURCES, the world-data columns left empty when its name isn't there
+    found = []
+    for name, _ in SOURCES.values():
+        found.append(database.select(name, {"Code": "Code", "Entity": "Country"}, REAL_CODES))
+    codes = pd.concat(found).drop_duplicates("Code").set_index("Code").sort_index()
+
+    world = datasets.get("world")[["Country", "Abbreviation", "Population", "GDP"]]
+    world = world.astype({"Country": str}).drop_duplicates("Country").set_index("Country")
+    names = [ALIASES.get(country, country) for country in codes["Country"]]
+    matched = world.reindex(names).set_axis(codes.index)
+    return pd.concat([codes, matched], axis=1)
+
+
+def build():
+    # Every (Year, Code) that any source has a value for, sorted
+    columns = {}
+    for column, (name, value_col) in SOURCES.items():
+        df = database.select(name, {"Year": "Year", "Code": "Code", value_col: column}, REAL_CODES)
+        columns[column] = df.set_index(["Year", "Code"])[column]
+    cube = pd.concat(columns, axis=1).sort_index()
+
+    codes = country_codes()
+    code = cube.index.get_level_values("Code")
+    for col in ("Country", "Population", "GDP"):
+        cube[col] = codes[col].reindex(code).to_numpy()
+
+    population = cube["Population"]
+    gdp_billions = cube["GDP"] / 1e9
+    # Patents are reported per million people already
+    cube["patents_per_capita"] = cube["patents"]
+    cube["patents_per_gdp"] = cube["patents"] * population / 1e6 / gdp_billions
+    cube["investment_per_capita"] = cube["investment"] / population
+    cube["investment_per_gdp"] = cube["investment"] / cube["GDP"] * 100
+    cube["robots_per_capita"] = cube["robots"] / population * 1e6
+    cube["robots_per_gdp"] = cube["robots"] / gdp_billions
+    return cube
+
+
+def get():
+    # The cube for the current versions of DATASETS
+    version = tuple(datasets.version(name) for name in DATASETS)
+    cube = _cubes.get(version)
+    if cube is None:
+        with _lock:
+            cube = _cubes.get(version)
+            if cube is None:
+                with timing.stage("figure", "country cube"):
+                    cube = build()
+                _cubes.clear()
+                _cubes[version] = cube
+    return cube
+
+
+def clear():
+    _cubes.clear()
+
+
+############################################################################################################################################################################
+def years(column):
+    # Years with at least one country value for `column`
+    values = get()[column].dropna()
+    return sorted(values.index.get_level_values("Year").unique())
+
+
+def year(column, selected_year):
+    # Country, Code, Value rows of one year (an index lookup), countries
+    # without a value dropped
+    cube = get()
+    try:
+        rows = cube.loc[selected_year]
+    except KeyError:
+        rows = cube.iloc[:0].droplevel("Year")
+    return _values(rows, column).reset_index()[["Country", "Code", "Value"]]
+
+
+def all_years(column):
+    # Year, Country, Code, Value rows of every year, in (Year, Code) order
+    return _values(get(), column).reset_index()[["Year", "Country", "Code", "Value"]]
+
+
+def _values(rows, column):
+    rows = rows[["Country", column]].rename(columns={column: "Value"})
+    return rows[rows["Value"].notna()]
@@ -0,0 +1,305 @@
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import datasets
+import persist
+import schema
+import timing
+
+# SQLite copy of the datasets the slides filter (s2's year, s3's entities,
+# s6's impact threshold and job lookup), so those filters are index lookups
+# in a file instead of boolean masks over a DataFrame held in memory, and the
+# datasets behind them never have to fit in RAM.
+#
+# A dataset's table is built from its CSV in chunks of CHUNK_ROWS rows, with
+# the same column types (schema.py) and cleaning step (datasets.py) as the
+# in-memory frame. Each table records the (mtime, size) of the CSV and the
+# version of the cleaning code it was built from; the first query against a
+# table that doesn't match them any more builds it again, so
+#
+#   python ingest.py --sqlite            # build every out-of-date table now
+#   python ingest.py --sqlite jobs ...   # only these
+#
+# only moves that work ahead of the first visitor. Indexes are created on the
+# INDEXED columns each table has.
+#
+# Tables are versioned like the frames in datasets.py (see datasets.track):
+# while watcher.py runs, a changed CSV is only built into its table by the
+# watcher (reload), once the file has stopped changing, and the figures drawn
+# from the old table are dropped after that. A build that fails (a half
+# written or malformed file) is rolled back and the previous table keeps
+# being served.
+#
+# Queries borrow a connection from a small per-process pool (connection()),
+# so a rerun doesn't open a new one, and the WAL / sources table setup runs
+# once per process.
+#
+#   DECK_DB=path             where the database lives (default deck.sqlite next to the app)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("DECK_DB") or os.path.join(HERE, "deck.sqlite")
+CHUNK_ROWS = 50_000
+# Idle connections kept open per process; more are opened while more threads
+# query at once, and closed when they are handed back
+POOL_SIZE = 4
+
+# Datasets the slides query here rather than through datasets.get()
+TABLES = ("patents", "investment", "robots", "jobs")
+INDEXED = ("Year", "Entity", "Country", "Code", "AI_Impact", "Job_titiles")
+# Code that decides what a table holds
+TABLE_CODE = persist.FRAME_CODE + ("database.py",)
+
+log = logging.getLogger(__name__)
+
+_locks = {name: threading.Lock() for name in TABLES}
+_pool_lock = threading.Lock()
+_pool = []
+# Process the pool (and the WAL / sources setup) belongs to: a worker forked
+# by warmup.py must not reuse its parent's connections
+_pool_pid = None
+# name -> (stamp, code version) of the table as last checked in this process
+_ready = {}
+# name -> (stamp, code version) of a file that failed to build, while an
+# older table is served instead
+_failed = {}
+
+
+@contextlib.contextmanager
+def connection():
+    # A connection from this process's pool, handed back on exit. Streamlit
+    # runs each rerun on a new thread, so pooled connections aren't tied to
+    # the thread that opened them.
+    con = _take()
+    try:
+        yield con
+    finally:
+        _give(con)
+
+
+def _take():
+    global _pool_pid
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            # Left alone, not closed: they are the parent's
+            _pool.clear()
+            con = _open()
+            # Readers don't wait for a table being rebuilt, and vice versa
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, code TEXT)")
+            _pool_pid = os.getpid()
+            return con
+        if _pool:
+            return _pool.pop()
+    return _open()
+
+
+def _open():
+    return sqlite3.connect(DB_PATH, timeout=60, isolation_level=None, check_same_thread=False)
+
+
+def _give(con):
+    with _pool_lock:
+        if _pool_pid == os.getpid() and len(_pool) < POOL_SIZE:
+            _pool.append(con)
+            return
+    con.close()
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+############################################################################################################################################################################
+def ensure(name):
+    # Make sure `name`'s table matches the dataset's current version,
+    # building it if needed. If that build fails and an older table exists,
+    # the older one is served.
+    _refresh(name, datasets.version(name), keep_old=True)
+
+
+def reload(name):
+    # Build `name`'s table from the file on disk now (see watcher.py). Raises
+    # if it can't be read; the previous table stays as it was.
+    _refresh(name, datasets.on_disk(name), keep_old=False)
+
+
+def _refresh(name, stamp, keep_old):
+    wanted = (stamp, persist.code_version(TABLE_CODE))
+    if _ready.get(name) == wanted or (keep_old and _failed.get(name) == wanted):
+        return
+    with _locks[name]:
+        if _ready.get(name) == wanted or (keep_old and _failed.get(name) == wanted):
+            return
+        with connection() as con:
+            # IMMEDIATE takes the write lock up front, so another process
+            # that is building the same table finishes first and is then
+            # seen here
+            con.execute("BEGIN IMMEDIATE")
+            row = None
+            try:
+                row = con.execute("SELECT mtime_ns, size, code FROM sources WHERE name = ?", (name,)).fetchone()
+                if row != (stamp[0], stamp[1], wanted[1]):
+                    _build(con, name, *wanted)
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                if not keep_old or row is None:
+                    raise
+                log.exception("building the %s table failed; serving the one built before", name)
+                _failed[name] = wanted
+                return
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        _ready[name] = wanted
+        _failed.pop(name, None)
+        datasets.track(name, stamp)
+
+
+def _build(con, name, stamp, code):
+    # Called inside a transaction
+    start = time.perf_counter()
+    file_name, cleaner = datasets.DATASETS[name]
+    table = _quote(name)
+    con.execute(f"DROP TABLE IF EXISTS {table}")
+    rows = 0
+    columns = None
+    with timing.stage("load", f"{name} sqlite ingest"):
+        for chunk in pd.read_csv(datasets.path(name), chunksize=CHUNK_ROWS):
+            chunk = schema.apply(file_name, chunk)
+            if cleaner is not None:
+                chunk = cleaner(chunk)
+            if columns is None:
+                columns = list(chunk.columns)
+                types = ", ".join(f"{_quote(col)} {_sql_type(chunk[col])}" for col in columns)
+                con.execute(f"CREATE TABLE {table} ({types})")
+            marks = ", ".join("?" * len(columns))
+            con.executemany(f"INSERT INTO {table} VALUES ({marks})", _values(chunk[columns]))
+            rows += len(chunk)
+        for col in INDEXED:
+            if columns is not None and col in columns:
+                con.execute(f"CREATE INDEX {_quote(f'{name}_{col}')} ON {table} ({_quote(col)})")
+    con.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", (name, stamp[0], stamp[1], code))
+    datasets.record_load(name, "sqlite ingest", rows, (time.perf_counter() - start) * 1000)
+
+
+def _sql_type(values):
+    kind = values.dtype.kind
+    if kind in "biu":
+        return "INTEGER"
+    if kind == "f":
+        return "REAL"
+    return "TEXT"
+
+
+def _values(chunk):
+    # Rows as plain Python values: NaN/NaT -> NULL, timestamps -> ISO text
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col]
+        if values.dtype.kind == "M":
+            values = values.dt.strftime("%Y-%m-%dT%H:%M:%S")
+        values = values.astype(object)
+        columns.append(values.where(values.notna(), None).tolist())
+    return zip(*columns)
+
+
+def clear():
+    # Drop every table, so the next query builds it again (bench.py's cold runs)
+    with connection() as con:
+        for name in TABLES:
+            with _locks[name]:
+                con.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+                con.execute("DELETE FROM sources WHERE name = ?", (name,))
+                _ready.pop(name, None)
+                _failed.pop(name, None)
+
+
+def is_ready(name):
+    return name in _ready
+
+
+def prepare(name):
+    # What loading `name` ahead of time means (warm-up, prefetch): its table
+    # for the queried datasets, the in-memory frame for the others
+    if name in TABLES:
+        ensure(name)
+    else:
+        datasets.get(name)
+
+
+############################################################################################################################################################################
+# Query API. Column names are quoted here; `where` and `order_by` are SQL
+# written by the caller with ? placeholders for every value.
+
+def select(name, columns=None, where=None, params=(), order_by=None, limit=None):
+    # DataFrame of the matching rows. `columns` is a list of column names or a
+    # {column: alias} dict; None means every column.
+    ensure(name)
+    if columns is None:
+        projection = "*"
+    elif isinstance(columns, dict):
+        projection = ", ".join(f"{_quote(col)} AS {_quote(alias)}" for col, alias in columns.items())
+    else:
+        projection = ", ".join(_quote(col) for col in columns)
+    sql = f"SELECT {projection} FROM {_quote(name)}"
+    if where:
+        sql += f" WHERE {where}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = tuple(params) + (int(limit),)
+    with timing.stage("load", f"{name} query"), connection() as con:
+        cursor = con.execute(sql, tuple(_param(p) for p in params))
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+    if rows:
+        return pd.DataFrame.from_records(rows, columns=names)
+    # No rows still gives the columns their types, so e.g. px draws an empty
+    # trace for a year a dataset doesn't have, as it did from the DataFrame
+    sources = list(columns) if columns is not None else names
+    types = _column_types(name)
+    return pd.DataFrame({alias: pd.Series(dtype=types.get(col, object)) for col, alias in zip(sources, names)})
+
+
+def distinct(name, column, where=None, params=()):
+    # Sorted distinct non-null values of one column (an index scan when the
+    # column is INDEXED)
+    ensure(name)
+    col = _quote(column)
+    sql = f"SELECT DISTINCT {col} FROM {_quote(name)} WHERE {col} IS NOT NULL"
+    if where:
+        sql += f" AND ({where})"
+    sql += f" ORDER BY {col}"
+    with timing.stage("load", f"{name} query"), connection() as con:
+        return [row[0] for row in con.execute(sql, tuple(_param(p) for p in params))]
+
+
+def aggregate(name, by, column, how="AVG"):
+    # {by: ..., column: how(column)} per group, as a DataFrame
+    ensure(name)
+    sql = (f"SELECT {_quote(by)}, {how}({_quote(column)}) AS {_quote(column)} "
+           f"FROM {_quote(name)} GROUP BY {_quote(by)} ORDER BY {_quote(by)}")
+    with timing.stage("load", f"{name} query"), connection() as con:
+        return pd.DataFrame.from_records(con.execute(sql).fetchall(), columns=[by, column])
+
+
+def _column_types(name):
+    # {column: dtype} from the table's declared types (see _sql_type)
+    dtypes = {"INTEGER": "int64", "REAL": "float64"}
+    with connection() as con:
+        info = con.execute(f"PRAGMA table_info({_quote(name)})").fetchall()
+    return {row[1]: dtypes.get(row[2], object) for row in info}
+
+
+def _param(value):
+    # numpy scalars (e.g. a year from distinct()) aren't sqlite3 parameters
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,271 @@
+import contextlib
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+import ingest
+import persist
+import resolver
+import schema
+import timing
+
+# Every CSV the deck reads goes through this registry. Each file is parsed and
+# cleaned once per server process and the cleaned DataFrame is shared by every
+# session, so slides must treat what get() returns as read-only.
+#
+# Files are read from their typed Arrow snapshot (see ingest.py) when one is
+# up to date, otherwise from the CSV. Either way the column types declared in
+# schema.py are already applied, so the cleaning steps below only drop and
+# reshape rows. The cleaned result is also kept in the on-disk cache
+# (persist.py), which is tried first, so a restarted server skips both.
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# How often (seconds) a cached entry re-checks its file's mtime/size. Reruns
+# inside this window are served straight from memory.
+CHECK_INTERVAL = 2.0
+# Set while watcher.py runs: it then picks up changed files on its own (once
+# they stop changing), and get() stops checking them
+_watched = threading.Event()
+
+log = logging.getLogger(__name__)
+
+
+############################################################################################################################################################################
+# Cleaning steps, one per file
+
+def clean_layoffs(df):
+    # Drop rows where critical data for graphing is missing
+    df = df.dropna(subset=['Layoffs', 'Year'])
+    # Make sure 'Year' is an integer
+    df = df.astype({'Year': int})
+    return df
+
+
+def clean_employment_data(df):
+    # Drop rows missing growth data
+    df = df.dropna(subset=['Percent change, 2023-33'])
+
+    # Drop the "Total, all occupations" row
+    df = df[df["Occupation"] != "Total, all occupations"]
+    return df
+
+
+def clean_jobs(df):
+    df.columns = [col.replace(" ", "_") for col in df.columns]
+    df['AI_Impact'] = df['AI_Impact'].astype(int)
+    return df
+
+
+def clean_patents(df):
+    return df.dropna(subset=['Patent applications per 1 million people - Field: All'])
+
+
+def clean_timeline(df):
+    df = df.sort_values("Year")
+    # Datetime ranges for plotting each event as a one-year block
+    df["Start"] = pd.to_datetime(df["Year"], format="%Y")
+    df["End"] = df["Start"] + pd.Timedelta(days=365)
+    return df
+
+
+def clean_rise_of_ai(df):
+    return df.sort_values('Year')
+
+
+############################################################################################################################################################################
+# name -> (file, cleaning step)
+DATASETS = {
+    "layoffs": ("Layoff_Trend_Analyzed_30_Years_Final.csv", clean_layoffs),
+    "employment": ("employment-projections.csv", clean_employment_data),
+    "patents": ("artificial-intelligence-patents-submitted-per-million.csv", clean_patents),
+    "investment": ("private-investment-in-artificial-intelligence-cset.csv", None),
+    "robots_total": ("industrial-robots-annual-installations-total-operational.csv", None),
+    "china_usa": ("CHINA-VS-USA.csv", None),
+    "robots": ("annual-industrial-robots-installed.csv", None),
+    "timeline": ("ai-race-timeline.csv", clean_timeline),
+    "ai_vs_human": ("AI-VS-Human.csv", None),
+    "jobs": ("My_Data.csv", clean_jobs),
+    "rise_of_ai": ("The Rise Of Artificial Intellegence2.csv", clean_rise_of_ai),
+    "world": ("world-data-2023.csv", None),
+}
+
+# name -> {"stamp": (mtime_ns, size), "checked": monotonic time, "frame": DataFrame}
+_cache = {}
+# name -> {"stamp": ..., "checked": ...} for the datasets served from SQLite
+# tables (database.py) instead of a frame here: the file each table was built
+# from, so version() and changed() treat them like the loaded frames
+_tables = {}
+_locks = {name: threading.Lock() for name in DATASETS}
+
+# One record per parse of a file: what was loaded, from where, how long it
+# took and which slide asked for it (see loading_for)
+_loads = []
+_local = threading.local()
+
+
+def path(name):
+    # Local file `name` is read from, via resolver.py, so a URL in DATASETS
+    # is read from its cached download
+    source = DATASETS[name][0]
+    if not source.startswith(("http://", "https://")):
+        source = os.path.join(DATA_DIR, source)
+    return resolver.resolve(source)
+
+
+def _stamp(name):
+    info = os.stat(path(name))
+    return (info.st_mtime_ns, info.st_size)
+
+
+def on_disk(name):
+    # (mtime_ns, size) of the file as it is now
+    return _stamp(name)
+
+
+def _fresh(entry):
+    if _watched.is_set():
+        return True
+    if time.monotonic() - entry["checked"] < CHECK_INTERVAL:
+        return True
+    if _stamp(entry["name"]) == entry["stamp"]:
+        entry["checked"] = time.monotonic()
+        return True
+    return False
+
+
+def get(name):
+    entry = _cache.get(name)
+    if entry is not None and _fresh(entry):
+        return entry["frame"]
+
+    with _locks[name]:
+        # Another session may have reloaded it while we waited
+        entry = _cache.get(name)
+        if entry is not None and _fresh(entry):
+            return entry["frame"]
+        return _load(name)
+
+
+def reload(name):
+    # Parse `name` again now if its file changed since it was loaded (see
+    # watcher.py). The old frame keeps being served until the new one is
+    # ready, and stays if the new file can't be read.
+    with _locks[name]:
+        entry = _cache.get(name)
+        if entry is not None and _stamp(name) == entry["stamp"]:
+            return entry["frame"]
+        return _load(name)
+
+
+def use_watcher():
+    _watched.set()
+
+
+def changed():
+    # Loaded datasets whose file on disk is no longer the one they were
+    # parsed from, as {name: (mtime_ns, size) on disk}
+    found = {}
+    for name, entry in list(_cache.items()) + list(_tables.items()):
+        try:
+            stamp = _stamp(name)
+        except OSError:
+            # Mid-replace or deleted: keep serving what we have
+            continue
+        if stamp != entry["stamp"]:
+            found[name] = stamp
+    return found
+
+
+def _load(name):
+    # Called with _locks[name] held
+    start = time.perf_counter()
+    stamp = _stamp(name)
+    file_name, cleaner = DATASETS[name]
+    df = None
+    if persist.ENABLED:
+        # Cleaned frame from an earlier run of the server, if the CSV's
+        # contents and the cleaning code are unchanged
+        disk_key = persist.frame_key(name, path(name), stamp)
+        with timing.stage("load", f"{name} disk cache"):
+            df = persist.read_frame(disk_key)
+        source = "disk cache"
+
+    if df is None:
+        source = "snapshot"
+        with timing.stage("load", f"{name} snapshot"):
+            df = ingest.read_snapshot(name, stamp, schema.fingerprint(file_name))
+        if df is None:
+            source = "csv"
+            with timing.stage("load", f"read_csv {file_name}"):
+                df = pd.read_csv(path(name))
+        if source == "csv":
+            with timing.stage("clean", f"{name} schema"):
+                df = schema.apply(file_name, df)
+        if cleaner is not None:
+            with timing.stage("clean", cleaner.__name__):
+                df = cleaner(df)
+        if persist.ENABLED:
+            persist.write_frame(disk_key, df)
+
+    _cache[name] = {"name": name, "stamp": stamp, "checked": time.monotonic(), "frame": df}
+
+    record_load(name, source, len(df), (time.perf_counter() - start) * 1000)
+    return df
+
+
+def track(name, stamp):
+    # Called by database.py once `name`'s table holds the file with `stamp`
+    _tables[name] = {"name": name, "stamp": stamp, "checked": time.monotonic()}
+
+
+def record_load(name, source, rows, ms):
+    # One entry of the data loading report; also used by database.py, whose
+    # tables are loaded without a frame here
+    record = {
+        "name": name,
+        "source": source,
+        "rows": rows,
+        "ms": ms,
+        "for": getattr(_local, "label", None),
+    }
+    _loads.append(record)
+    log.info("loaded %(name)s from %(source)s (%(rows)d rows) in %(ms).1f ms for %(for)s", record)
+
+
+def version(name):
+    # (mtime_ns, size) of the file behind the cached frame (or the SQLite
+    # table, see track). Datasets that are
+    # not loaded yet (or are about to be reloaded) report the file on disk
+    # without parsing it; the next get() loads exactly that file.
+    entry = _cache.get(name) or _tables.get(name)
+    if entry is not None and _fresh(entry):
+        return entry["stamp"]
+    return _stamp(name)
+
+
+@contextlib.contextmanager
+def loading_for(label):
+    # Attribute loads made by this thread to `label` (a slide title)
+    previous = getattr(_local, "label", None)
+    _local.label = label
+    try:
+        yield
+    finally:
+        _local.label = previous
+
+
+def loads():
+    return list(_loads)
+
+
+def is_loaded(name):
+    return name in _cache
+
+
+def clear():
+    _cache.clear()
+    _tables.clear()
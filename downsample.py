@@ -0,0 +1,162 @@
+import os
+
+import numpy as np
+
+# Server-side downsampling of long line/scatter traces, so a series with
+# millions of points sends the browser only about as many as the chart has
+# pixels to draw them on.
+#
+# figcache runs every figure through figure() before caching it. A trace is
+# reduced when it has more than target_points(width) points and its x values
+# are ordered (a time series); unordered scatter clouds and filled shapes are
+# left alone. Points are picked, never interpolated, and every per-point
+# attribute (customdata, hover text, marker sizes/colors, ...) is sliced with
+# the same indices, so hover labels stay right.
+#
+#   lttb     Largest-Triangle-Three-Buckets: keeps the points that best
+#            preserve the line's visual shape (default)
+#   minmax   the lowest and highest point of each bucket: cheaper, and never
+#            flattens a spike
+#
+#   DECK_CHART_WIDTH=px      width assumed for full-width charts (default 1920)
+#   DECK_DOWNSAMPLE=method   lttb, minmax or off
+
+WIDTH = int(os.environ.get("DECK_CHART_WIDTH", "1920"))
+METHOD = os.environ.get("DECK_DOWNSAMPLE", "lttb")
+# Two points per pixel column: enough for the min and the max of each
+POINTS_PER_PIXEL = 2
+MIN_POINTS = 500
+
+TRACE_TYPES = ("scatter", "scattergl")
+
+
+def target_points(width=None):
+    return max(MIN_POINTS, int((width or WIDTH) * POINTS_PER_PIXEL))
+
+
+############################################################################################################################################################################
+def lttb(x, y, n_out):
+    # Indices of the n_out points picked by LTTB: the first and last point,
+    # plus from each of n_out - 2 equal buckets the point making the largest
+    # triangle with the previous pick and the next bucket's average
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Buckets over the inner points 1 .. n-2; edges are strictly increasing
+    # because there are more points than buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    picked = np.empty(n_out, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle areas; the constant factor doesn't change the argmax
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(x, y, n_out):
+    # Indices of the lowest and highest point of n_out / 2 equal buckets, plus
+    # the first and last point, in order. NaNs (line gaps) never win a bucket
+    # unless the whole bucket is NaN.
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = n_out // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.intp)
+
+    # Buckets padded to the same width, so one argmin/argmax covers them all
+    width = int(np.diff(edges).max())
+    idx = edges[:-1, None] + np.arange(width)
+    inside = idx < edges[1:, None]
+    idx = np.minimum(idx, n - 1)
+    values = y[idx]
+    missing = ~inside | np.isnan(values)
+    rows = np.arange(buckets)
+    lows = idx[rows, np.argmin(np.where(missing, np.inf, values), axis=1)]
+    highs = idx[rows, np.argmax(np.where(missing, -np.inf, values), axis=1)]
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def indices(x, y, n_out, method=None):
+    method = method or METHOD
+    if method == "lttb" and not np.isfinite(y).all():
+        # LTTB's bucket averages can't take gaps
+        method = "minmax"
+    return METHODS[method](x, y, n_out)
+
+
+############################################################################################################################################################################
+def figure(fig, width=None, method=None):
+    # Downsample fig's long ordered line/scatter traces (animation frames
+    # included) in place; width defaults to the figure's own, then WIDTH
+    method = method or METHOD
+    if method == "off":
+        return fig
+    n_out = target_points(width or fig.layout.width)
+    for trace in fig.data:
+        _trace(trace, n_out, method)
+    for frame in fig.frames:
+        for trace in frame.data:
+            _trace(trace, n_out, method)
+    return fig
+
+
+def _trace(trace, n_out, method):
+    if trace.type not in TRACE_TYPES or trace.fill == "toself":
+        return
+    props = trace.to_plotly_json()
+    y = props.get("y")
+    if y is None or len(y) <= n_out:
+        return
+    y = np.asarray(y)
+    if y.dtype.kind not in "iuf":
+        return
+    x = _ordered_x(props.get("x"), len(y))
+    if x is None:
+        return
+    keep = indices(x, y, n_out, method)
+    trace.update(_sliced(props, len(y), keep))
+
+
+def _ordered_x(x, n):
+    # x as numbers if it only ever goes forward, else None
+    if x is None:
+        return np.arange(n)
+    x = np.asarray(x)
+    if len(x) != n:
+        return None
+    if x.dtype.kind == "M":
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    elif x.dtype.kind not in "iuf":
+        return None
+    return x if (np.diff(x) >= 0).all() else None
+
+
+def _sliced(props, n, keep):
+    # Every per-point array in props (nested ones too), cut down to `keep`
+    sliced = {}
+    for key, value in props.items():
+        if isinstance(value, dict):
+            inner = _sliced(value, n, keep)
+            if inner:
+                sliced[key] = inner
+        elif isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+            sliced[key] = np.asarray(value)[keep]
+    return sliced
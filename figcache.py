@@ -0,0 +1,201 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+import datasets
+import downsample
+import payload
+import persist
+import timing
+
+# Finished figures shared by every session. An entry is keyed by the builder
+# function, the versions of the datasets it reads and the widget values it was
+# called with, so an entry never goes stale; it simply stops being asked for
+# once its inputs change and ages out of the LRU.
+#
+# Each entry keeps the serialized JSON (which is what the size bound counts)
+# next to the Figure object. Handing the Figure back to st.plotly_chart skips
+# plotly's per-trace validation, which is most of the cost of a rebuild.
+# Builders of raster charts return PNG bytes, which are kept as they are.
+# Figures are downsampled (downsample.py) and compacted (payload.py) first,
+# which is what every session is then sent; the size before that is kept for
+# the perf panel.
+#
+# The JSON (or PNG) is also written to the on-disk cache (persist.py); a miss
+# here is served from there before anything is rebuilt, e.g. after a restart.
+
+MAX_BYTES = int(float(os.environ.get("DECK_FIGCACHE_MB", "64")) * 1024 * 1024)
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "invalidations": 0, "bytes": 0}
+# id(figure) -> (JSON size, size before compaction) of the figures currently
+# cached, for payload_bytes
+_sizes = {}
+
+
+def cached(*dataset_names, datasets_of=None):
+    # Decorator for figure builders: @cached("jobs") def job_risk(min_impact, view_mode).
+    # A builder whose dataset is picked by one of its arguments passes
+    # datasets_of(*args) -> names instead, so each figure is keyed on (and
+    # invalidated with) only the dataset it was drawn from.
+    def decorate(build):
+        def names(*args):
+            return tuple(datasets_of(*args)) if datasets_of is not None else dataset_names
+
+        def key(*args):
+            return (build.__name__, tuple(datasets.version(name) for name in names(*args)), args)
+
+        @functools.wraps(build)
+        def wrapper(*args):
+            return figure(key(*args), lambda: build(*args), names(*args))
+        wrapper.datasets = names
+        wrapper.key = key
+        return wrapper
+    return decorate
+
+
+def figure(key, build, dataset_names=None):
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return entry["figure"]
+        _stats["misses"] += 1
+
+    if dataset_names is not None:
+        fig = restore(key, dataset_names)
+        if fig is not None:
+            return fig
+
+    # Build outside the lock so slow figures don't block other sessions
+    with timing.stage("figure", key[0]):
+        fig = build()
+    if isinstance(fig, bytes):
+        text = fig
+        store(key, {"json": fig, "figure": fig, "datasets": dataset_names})
+    else:
+        with timing.stage("serialize", key[0]):
+            fig, text, raw_bytes = serialize(fig)
+        store(key, {"json": text, "figure": fig, "raw_bytes": raw_bytes, "datasets": dataset_names})
+    if dataset_names is not None and persist.ENABLED:
+        persist.write_figure(_disk_key(key, dataset_names), text)
+    return fig
+
+
+def serialize(fig):
+    # (compacted figure, its JSON, JSON size as built)
+    raw_bytes = len(pio.to_json(fig, validate=False))
+    fig = payload.compact(downsample.figure(fig))
+    return fig, pio.to_json(fig, validate=False), raw_bytes
+
+
+def _disk_key(key, dataset_names):
+    # key[1] holds the (mtime, size) of each dataset, in dataset_names order
+    sources = [(datasets.path(name), stamp) for name, stamp in zip(dataset_names, key[1])]
+    return persist.figure_key(key[0], key[2], sources)
+
+
+def restore(key, dataset_names):
+    # The figure for `key` from the on-disk cache, now also cached here; None
+    # if it isn't on disk
+    if not persist.ENABLED:
+        return None
+    text = persist.read_figure(_disk_key(key, dataset_names))
+    if text is None:
+        return None
+    if isinstance(text, bytes):
+        # PNG of a raster chart, served as is
+        fig = text
+    else:
+        with timing.stage("load", f"{key[0]} disk cache"):
+            fig = pio.from_json(text)
+    store(key, {"json": text, "figure": fig, "datasets": dataset_names})
+    with _lock:
+        _stats["disk_hits"] += 1
+    return fig
+
+
+def put(key, text, dataset_names=None):
+    # Add a figure serialized elsewhere (e.g. built in another process by
+    # warmup.py) under the key its builder would use here
+    with _lock:
+        if key in _cache:
+            return
+    if isinstance(text, bytes):
+        store(key, {"json": text, "figure": text, "datasets": dataset_names})
+    else:
+        with timing.stage("serialize", key[0]):
+            fig = pio.from_json(text)
+        store(key, {"json": text, "figure": fig, "datasets": dataset_names})
+    if dataset_names is not None and persist.ENABLED:
+        persist.write_figure(_disk_key(key, dataset_names), text)
+
+
+def store(key, entry):
+    with _lock:
+        old = _cache.pop(key, None)
+        if old is not None:
+            _forget(old)
+        _cache[key] = entry
+        _stats["bytes"] += len(entry["json"])
+        _sizes[id(entry["figure"])] = (len(entry["json"]), entry.get("raw_bytes"))
+
+        # Evict least recently used entries, but always keep the newest one
+        while _stats["bytes"] > MAX_BYTES and len(_cache) > 1:
+            _, evicted = _cache.popitem(last=False)
+            _forget(evicted)
+            _stats["evictions"] += 1
+
+
+def invalidate(name):
+    # Drop the figures built from a version of dataset `name` other than the
+    # current one (after watcher.py reloaded it); figures that don't read it
+    # are left alone. Returns how many were dropped.
+    version = datasets.version(name)
+    with _lock:
+        stale = [
+            key for key, entry in _cache.items()
+            if name in (entry.get("datasets") or ())
+            and key[1][entry["datasets"].index(name)] != version
+        ]
+        for key in stale:
+            _forget(_cache.pop(key))
+        _stats["invalidations"] += len(stale)
+    return len(stale)
+
+
+def _forget(entry):
+    _stats["bytes"] -= len(entry["json"])
+    _sizes.pop(id(entry["figure"]), None)
+
+
+def payload_bytes(fig):
+    # (size of the JSON sent for a figure, size before compaction or None);
+    # free for cached figures
+    with _lock:
+        sizes = _sizes.get(id(fig))
+    if sizes is None:
+        sizes = (len(pio.to_json(fig, validate=False)), None)
+    return sizes
+
+
+def stats():
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return dict(
+            _stats,
+            entries=len(_cache),
+            hit_ratio=_stats["hits"] / lookups if lookups else 0.0,
+        )
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _sizes.clear()
+        _stats.update(hits=0, misses=0, disk_hits=0, evictions=0, invalidations=0, bytes=0)
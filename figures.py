@@ -0,0 +1,496 @@
+import io
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import countrycube
+import database
+import datasets
+import frames
+import jobindex
+import timing
+from figcache import cached
+
+# Figure builders for the slides in groupapp.py. Nothing in here touches
+# Streamlit: each builder takes the widget values it depends on and returns a
+# Plotly figure (or PNG bytes for the matplotlib charts at the end), and
+# @cached serves repeat calls from the shared figure cache. The names passed
+# to @cached are the datasets each figure reads.
+
+############################################################################################################################################################################
+@cached("layoffs")
+def layoffs_by_year():
+    layoffs_df = datasets.get("layoffs")
+    # Filter to only 2010–2024
+    layoffs_df = layoffs_df[layoffs_df['Year'] >= 2010]
+
+    # Summarize layoffs and global events
+    layoffs_summary = layoffs_df.groupby('Year').agg({
+        'Layoffs': 'sum',
+        'Global_Event': lambda x: ', '.join(x.dropna().unique())  # Combine unique events for that year
+    }).reset_index()
+
+    # Create a line plot with large scatter markers for each year
+    fig = px.line(
+        layoffs_summary,
+        x='Year',
+        y='Layoffs',
+        title='Total Layoffs per Year (2010–2024)',
+        labels={'Layoffs': 'Number of Layoffs in Thousands', 'Year': 'Year'},
+        markers=True,  # This adds markers at each data point on the line
+    )
+
+    # Customize the scatter markers to make them bigger
+    fig.update_traces(
+        marker=dict(
+            size=12,  # Adjust size of the markers (bubbles)
+            color='rgb(255, 0, 0)',  # Optional: Change marker color
+            opacity=0.8,  # Optional: Adjust opacity for a more transparent effect
+            line=dict(width=2, color='DarkSlateGrey')  # Optional: Add border around the bubbles
+        ),
+        hovertemplate="<b>Year: %{x}</b><br>Layoffs: %{y}<br>Global Event: %{customdata[0]}<br>"  # Display global event on hover
+    )
+
+    # Add the global event data as custom data to be displayed when hovering over the markers
+    fig.update_traces(customdata=layoffs_summary[['Global_Event']].values)
+    return fig
+
+
+@cached("employment")
+def fastest_growing(top_n):
+    df = datasets.get("employment")
+
+    top_jobs = df.sort_values("Percent change, 2023-33", ascending=False).head(top_n)
+
+    fig = px.bar(
+        top_jobs,
+        x="Percent change, 2023-33",
+        y="Occupation",
+        orientation="h",
+        title=f"Top {top_n} Fastest Growing Occupations (2023–2033)",
+        labels={"Percent change, 2023-33": "Growth (%)", "Occupation": "Occupation"},
+    )
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+@cached("employment")
+def employment_vs_growth():
+    df = datasets.get("employment")
+    # Normalize bubble size (projected employment)
+    projected = df["Projected employment, 2033"]
+    df = df.assign(**{
+        "Normalized size": (projected - projected.min()) / (projected.max() - projected.min()) * 60  # 60 is the max bubble size
+    })
+
+    fig = px.scatter(
+        df,
+        x="Employment, 2023",
+        y="Percent change, 2023-33",
+        size="Normalized size",
+        hover_name="Occupation",
+        title="2023 Employment vs. Growth Rate (Normalized Bubble Size)",
+        labels={
+            "Employment, 2023": "Employment in 2023",
+            "Percent change, 2023-33": "Percent Change (2023–2033)",
+            "Projected employment, 2033": "2033 Employment"
+        },
+        size_max=60  # still useful to cap largest bubble
+    )
+    return fig
+
+
+############################################################################################################################################################################
+# s2 radio choice -> (dataset, value column, title)
+COUNTRY_METRICS = {
+    'AI Patent Applications': ("patents", 'Patent applications per 1 million people - Field: All', "AI-Related Patent Applications per Million"),
+    'Private Investment in AI': ("investment", 'Estimated investment - Field: All', "Private Investment in AI by Country"),
+    'Industrial Robots Installed': ("robots", 'Annual industrial robots installed', "Annual Industrial Robots Installed by Country"),
+}
+
+# s2 scale radio -> suffix of the country cube column (None: the dataset as is)
+COUNTRY_SCALES = {
+    'As reported': None,
+    'Per person': "per_capita",
+    'Relative to GDP': "per_gdp",
+}
+
+
+def country_values(dataset_choice, where=None, params=(), order_by=None):
+    # Rows of the chosen dataset matching `where` (SQL, see database.py)
+    name, value_col, title = COUNTRY_METRICS[dataset_choice]
+    # Standardize column names
+    columns = {'Entity': 'Country', 'Code': 'Code', 'Year': 'Year', value_col: 'Value'}
+    df = database.select(name, columns, where, params, order_by)
+    return df, title
+
+
+def country_years(dataset_choice, scale='As reported'):
+    name = COUNTRY_METRICS[dataset_choice][0]
+    if COUNTRY_SCALES[scale] is not None:
+        return countrycube.years(cube_column(dataset_choice, scale))
+    return database.distinct(name, 'Year')
+
+
+def country_dataset(dataset_choice, *args):
+    # The one dataset a map of `dataset_choice` is drawn from (for @cached)
+    return (COUNTRY_METRICS[dataset_choice][0],)
+
+
+def cube_column(dataset_choice, scale):
+    return f"{COUNTRY_METRICS[dataset_choice][0]}_{COUNTRY_SCALES[scale]}"
+
+
+@cached(datasets_of=country_dataset)
+def country_choropleth(dataset_choice, selected_year):
+    # --- Filter by selected year (an index lookup) ---
+    year_df, title = country_values(dataset_choice, '"Year" = ?', (selected_year,))
+
+    vmin = year_df['Value'].min()
+    vmax = year_df['Value'].max()
+
+    # --- Plot Heatmap ---
+    fig = px.choropleth(
+        year_df,
+        locations="Country",
+        locationmode="country names",
+        color="Value",
+        color_continuous_scale="Reds",
+        range_color=(vmin, vmax),
+        title=f"{title} ({selected_year})"
+    )
+    return fig
+
+
+def country_default(dataset_choice):
+    # The map as s2 first shows it, on the latest year
+    return country_choropleth(dataset_choice, int(max(country_years(dataset_choice))))
+
+
+@cached(datasets_of=country_dataset)
+def country_animation(dataset_choice):
+    # Every year as a frame of one figure, so scrubbing happens in the browser.
+    # ISO3 codes locate countries (see countrycube.REAL_CODES) and the color
+    # range is fixed across years so frames stay comparable.
+    display_df, title = country_values(dataset_choice, countrycube.REAL_CODES, order_by='"Year", rowid')
+
+    fig = px.choropleth(
+        display_df,
+        locations="Code",
+        color="Value",
+        hover_name="Country",
+        animation_frame="Year",
+        color_continuous_scale="Reds",
+        range_color=(display_df['Value'].min(), display_df['Value'].max()),
+        title=title
+    )
+    return fig
+
+
+# Per-person and relative-to-GDP versions of the two maps above, read from the
+# country cube (countrycube.py), which already joins each dataset to the
+# world-data-2023 population and GDP
+@cached(*countrycube.DATASETS)
+def scaled_choropleth(dataset_choice, scale, selected_year):
+    column = cube_column(dataset_choice, scale)
+    year_df = countrycube.year(column, selected_year)
+
+    fig = px.choropleth(
+        year_df,
+        locations="Code",
+        color="Value",
+        hover_name="Country",
+        color_continuous_scale="Reds",
+        range_color=(year_df['Value'].min(), year_df['Value'].max()),
+        labels={'Value': ''},
+        title=f"{countrycube.UNITS[column]} ({selected_year})"
+    )
+    return fig
+
+
+@cached(*countrycube.DATASETS)
+def scaled_animation(dataset_choice, scale):
+    column = cube_column(dataset_choice, scale)
+    display_df = countrycube.all_years(column)
+
+    fig = px.choropleth(
+        display_df,
+        locations="Code",
+        color="Value",
+        hover_name="Country",
+        animation_frame="Year",
+        color_continuous_scale="Reds",
+        range_color=(display_df['Value'].min(), display_df['Value'].max()),
+        labels={'Value': ''},
+        title=f"{countrycube.UNITS[column]} (2023 population and GDP)"
+    )
+    return fig
+
+
+@cached("china_usa")
+def china_vs_usa():
+    df = datasets.get("china_usa")
+    # Calculate stats
+    max_gap = df["Performance gap"].max()
+    min_gap = df["Performance gap"].min()
+    median_gap = df["Performance gap"].median()
+
+    # Get the corresponding rows for annotations
+    max_row = df[df["Performance gap"] == max_gap].iloc[0]
+    min_row = df[df["Performance gap"] == min_gap].iloc[0]
+    med_row = df[df["Performance gap"] == median_gap].iloc[0] if median_gap in df["Performance gap"].values else df.iloc[len(df)//2]
+
+    # Create figure
+    fig = go.Figure()
+
+    # China line
+    fig.add_trace(go.Scatter(
+        x=df["Date"], y=df["China model score"],
+        mode='lines+markers', name="China Model",
+        line=dict(color="red")
+    ))
+
+    # U.S. line
+    fig.add_trace(go.Scatter(
+        x=df["Date"], y=df["U.S. model score"],
+        mode='lines+markers', name="U.S. Model",
+        line=dict(color="blue")
+    ))
+
+    # Shaded gap area
+    fig.add_trace(go.Scatter(
+        x=pd.concat([df["Date"], df["Date"][::-1]]),
+        y=pd.concat([df["China model score"], df["U.S. model score"][::-1]]),
+        fill="toself",
+        fillcolor="rgba(100,100,200,0.2)",
+        line=dict(color="rgba(255,255,255,0)"),
+        hoverinfo="skip",
+        name="Performance Gap"
+    ))
+
+    # Add annotations for min, max, and median
+    for row, label, color in zip(
+        [max_row, min_row, med_row],
+        ["Max Gap", "Min Gap", "Median Gap"],
+        ["purple", "green", "orange"]
+    ):
+        fig.add_annotation(
+            x=row["Date"],
+            y=(row["China model score"] + row["U.S. model score"]) / 2,
+            text=f"{label}: {row['Performance gap']}",
+            showarrow=True,
+            arrowhead=1,
+            yshift=10,
+            font=dict(color=color, size=12),
+            bgcolor="white"
+        )
+
+    # Update layout
+    fig.update_layout(
+        title="China vs U.S. AI Model Scores (Performance Gap Highlighted)",
+        xaxis_title="Date",
+        yaxis_title="Model Score",
+        legend_title="Model",
+        hovermode="x unified"
+    )
+    return fig
+
+
+############################################################################################################################################################################
+@cached("robots")
+def robots_installed():
+    df = database.select("robots", where='"Entity" != ?', params=('World',))
+    return frames.animated_lines(
+        df, 'Entity', 'Year', 'Annual industrial robots installed',
+        x_title='Year', y_title='Robots Installed'
+    )
+
+
+@cached("ai_vs_human")
+def ai_vs_human():
+    df = datasets.get("ai_vs_human")
+
+    # Create line chart
+    fig = px.line(
+        df,
+        x="Year",
+        y="Perfomance relative to the human baseline (100%)",
+        color="Task",
+        markers=True,
+        title="AI Task Performance Over Time (Relative to Human Baseline = 100%)",
+        labels={"Perfomance relative to the human baseline (100%)": "Performance (%)", "Year": "Year", "Task": "Task"},
+    )
+
+    # Add horizontal baseline at 100%
+    fig.add_shape(
+        type="line",
+        x0=df["Year"].min(),
+        x1=df["Year"].max(),
+        y0=100,
+        y1=100,
+        line=dict(color="Black", dash="dash"),
+    )
+
+    fig.update_layout(legend_title="Task")
+    return fig
+
+
+@cached("timeline")
+def events_timeline():
+    # Sorted by year with Start/End datetime ranges already added
+    df = datasets.get("timeline")
+
+    # === Plotly Timeline (Color by Type) ===
+    fig = px.timeline(
+        df,
+        x_start="Start",
+        x_end="End",
+        y="Country",
+        color="Type",  # Color by Type, not Country
+        hover_name="Event",
+        hover_data=["Country", "Impact", "Description"],
+        title=f"AI Timeline Events)"
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+############################################################################################################################################################################
+@cached("jobs")
+def job_risk(min_impact, view_mode):
+    index = jobindex.get()
+
+    if view_mode == "Top 15 Most At-Risk":
+        risk_df = index.top(15, min_impact=min_impact)
+        chart_title = f"Top 15 Jobs with AI Impact ≥ {min_impact}%"
+        color_scale = "Reds"
+    else:
+        risk_df = index.bottom(15)
+        chart_title = "15 Jobs Least Affected by AI"
+        color_scale = "Greens"
+
+    fig = px.bar(
+        risk_df,
+        x="AI_Impact",
+        y="Job_titiles",
+        orientation="h",
+        labels={"AI_Impact": "AI Impact (%)", "Job_titiles": "Job Title"},
+        title=chart_title,
+        color="AI_Impact",
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(yaxis=dict(categoryorder='total ascending'))
+    return fig
+
+
+@cached("jobs")
+def domain_impact():
+    fig = px.bar(
+        jobindex.get().domain_avg,
+        x="Domain",
+        y="AI_Impact",
+        labels={"AI_Impact": "Average AI Impact (%)"},
+        color="AI_Impact",
+        color_continuous_scale="Oranges",
+        title="Industry-Wide Vulnerability to AI"
+    )
+    return fig
+
+
+############################################################################################################################################################################
+@cached("rise_of_ai")
+def ai_value():
+    ai = datasets.get("rise_of_ai")
+
+    fig = px.line(
+        ai,
+        x = 'Year',
+        y = ['AI Software Revenue(in Billions)',
+         'Global AI Market Value(in Billions)'],
+        markers = True,
+        title = 'The Value of Aritifical Intelligence'
+    )
+
+    fig.update_layout(
+        yaxis_title = 'Value (Billions $)',
+        yaxis_range = [0,2000]
+    )
+    return fig
+
+
+@cached("rise_of_ai")
+def ai_in_the_field():
+    # Percent columns are already numeric (see schema.py)
+    ai = datasets.get("rise_of_ai")
+
+    fig = px.line(
+        ai,
+        x = 'Year',
+        y = ['Organizations Using AI',
+        'Organizations Planning to Implement AI',
+        'Medical Professionals Using AI for Diagnosis',
+        'Expected Increase in Employee Productivity Due to AI (%)'],
+        title = 'AI in the Field',
+        markers = True
+    )
+
+    fig.update_layout(
+        yaxis_title = 'Percentage (%)',
+        yaxis_range = [0,70]
+    )
+    return fig
+
+
+############################################################################################################################################################################
+# Matplotlib charts are drawn on a bare Figure, which pyplot never registers
+# (so nothing piles up in its global figure list between reruns), and cached
+# as the PNG bytes st.pyplot would have produced from them. matplotlib is
+# imported by the builders, so a process that never draws one never loads it.
+
+def png_bytes(fig):
+    # Same settings st.pyplot rasterizes with
+    png = io.BytesIO()
+    fig.savefig(png, format="png", bbox_inches="tight", dpi=200)
+    return png.getvalue()
+
+
+@cached("rise_of_ai")
+def org_adoption_png(choice):
+    with timing.stage("import", "matplotlib"):
+        from matplotlib.figure import Figure
+
+    df       = datasets.get("rise_of_ai")
+    years    = df['Year'].astype(str)
+    planning = df['Organizations Planning to Implement AI']
+    using    = df['Organizations Using AI']
+    expect   = df['Global Expectation for AI Adoption (%)']
+
+    fig = Figure()
+    ax = fig.subplots()
+    if choice == "Implementation & Adoption":
+        # Grouped bar chart (side-by-side)
+        x     = range(len(years))
+        width = 0.4
+        ax.bar([i - width/2 for i in x], planning, width, label='Planning to Implement AI')
+        ax.bar([i + width/2 for i in x], using,    width, label='Using AI ')
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(years, rotation=45)
+        ax.set_ylim(0, 100)  # clamp to 0–100%
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Organizations (%)')
+        ax.set_title('Percentage of Organizations Planning vs. Using AI')
+    else:
+        # Simple line chart
+        ax.plot(years, expect, marker='o', linestyle='-', label='Global Expectation for AI Adoption ')
+
+        ax.set_xticks(range(len(years)))
+        ax.set_xticklabels(years, rotation=45)
+        ax.set_ylim(0, 100)
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Expectation (%)')
+        ax.set_title('Global Expectation for AI Adoption by Year')
+    ax.legend()
+    fig.tight_layout()
+    return png_bytes(fig)
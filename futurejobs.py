@@ -1,9 +1,10 @@
 import streamlit as st
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 
-projection = pd.read_csv('https://raw.githubusercontent.com/JunyiiBlvd/205_Final_Pro/refs/heads/master/employment-projections.csv')
+import resolver
+
+projection = resolver.read_csv('https://raw.githubusercontent.com/JunyiiBlvd/205_Final_Pro/refs/heads/master/employment-projections.csv')
 
 projection.rename(columns = {projection.columns[1]: 'Percent change'}, inplace = True)
 
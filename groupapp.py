@@ -1,24 +1,42 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
+
+import database
+import datasets
+import metrics
+import prefetch
+import slides as deck
+import timing
+import warmup
+import watcher
 
 
 
 # Page configuration
 st.set_page_config(page_title="The Race for Intelligence", layout="wide")
 
-# Define all slide names in order
-slides = [
-    "Layoffs and Workforce Dynamics",
-    "Jobs and Industries Most at Risk",
-    "Annual Industrial Robots Installed",
-    "Countries Leading the AI Revolution",
-    "Key Events Timeline (U.S. vs China)",
-    "AI Development and Prevalence"
-]
+# Prometheus metrics endpoint/file, if DECK_METRICS_PORT or DECK_METRICS_FILE is set
+metrics.start()
+
+# Reload datasets whose CSV is replaced while the server runs (DECK_WATCH=0 to turn off)
+watcher.start()
+
+# Slide titles in order, from the slides/ package. Each slide declares the
+# datasets it reads (nothing is loaded up front: a dataset is parsed the first
+# time a slide actually needs it, and this drives the data loading report in
+# the sidebar) and the figures it builds before any widget is touched. Its
+# module is only imported the first time the slide is shown.
+slides = [slide.title for slide in deck.registry()]
+slide_datasets = {slide.title: slide.datasets for slide in deck.registry()}
+
+# First run in this server process: build every slide's default figures in
+# the background (resolved there, so the figure modules import off this run)
+warmup.start(slide_datasets, lambda: {slide.title: slide.calls() for slide in deck.registry()})
 # --- Session State Navigation Logic ---
 if "current_slide" not in st.session_state:
     st.session_state.current_slide = slides[0]
@@ -38,631 +56,98 @@ slide = st.session_state.current_slide
 # Page content logic
 st.title("The Race for Intelligence")
 
-############################################################################################################################################################################
-def s1():
-    st.header("Layoffs and Workforce Dynamics")
-    st.subheader("Many country wide events have occured and have led to increased layoffs. Hovering over each bubble will show the event most correlated to the that years layoffs.")
-
-
-    # Load dataset
-    layoffs_df = pd.read_csv('Layoff_Trend_Analyzed_30_Years_Final.csv')
-    # Cleaning:
-    # 1. Filter to only 2010–2024
-    layoffs_df = layoffs_df[layoffs_df['Year'] >= 2010]
-
-    # 2. Drop rows where critical data for graphing is missing
-    layoffs_df = layoffs_df.dropna(subset=['Layoffs', 'Year'])
-
-    # 3. Optional: Handle missing industry/company names separately if needed
-
-    # 4. Make sure 'year' is an integer
-    layoffs_df['Year'] = layoffs_df['Year'].astype(int)
-
-    # Summarize layoffs and global events
-    layoffs_summary = layoffs_df.groupby('Year').agg({
-        'Layoffs': 'sum',
-        'Global_Event': lambda x: ', '.join(x.dropna().unique())  # Combine unique events for that year
-    }).reset_index()
-
-    # Create a line plot with large scatter markers for each year
-    fig = px.line(
-        layoffs_summary,
-        x='Year',
-        y='Layoffs',
-        title='Total Layoffs per Year (2010–2024)',
-        labels={'Layoffs': 'Number of Layoffs in Thousands', 'Year': 'Year'},
-        markers=True,  # This adds markers at each data point on the line
-    )
-
-    # Customize the scatter markers to make them bigger
-    fig.update_traces(
-        marker=dict(
-            size=12,  # Adjust size of the markers (bubbles)
-            color='rgb(255, 0, 0)',  # Optional: Change marker color
-            opacity=0.8,  # Optional: Adjust opacity for a more transparent effect
-            line=dict(width=2, color='DarkSlateGrey')  # Optional: Add border around the bubbles
-        ),
-        hovertemplate="<b>Year: %{x}</b><br>Layoffs: %{y}<br>Global Event: %{customdata[0]}<br>"  # Display global event on hover
-    )
-
-    # Add the global event data as custom data to be displayed when hovering over the markers
-    fig.update_traces(customdata=layoffs_summary[['Global_Event']].values)
-
-    # Show the plot
-    st.plotly_chart(fig, use_container_width=True)
-###########################################################################################################################################
-def s1_1(file_path, top_n):
-    st.subheader("Some jobs have seen immense growth despite the AI boom.")
-    df = clean_employment_data(file_path)
-
-    top_jobs = df.sort_values("Percent change, 2023-33", ascending=False).head(top_n)
-
-    fig = px.bar(
-        top_jobs,
-        x="Percent change, 2023-33",
-        y="Occupation",
-        orientation="h",
-        title=f"Top {top_n} Fastest Growing Occupations (2023–2033)",
-        labels={"Percent change, 2023-33": "Growth (%)", "Occupation": "Occupation"},
-    )
-    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig, use_container_width=True)
-    ###########################################################################################################################################
-def s1_2(file_path):
-    df = clean_employment_data(file_path)
-    # Normalize bubble size (projected employment)
-    df["Normalized size"] = (
-        (df["Projected employment, 2033"] - df["Projected employment, 2033"].min()) /
-        (df["Projected employment, 2033"].max() - df["Projected employment, 2033"].min())
-        ) * 60  # 60 is your max bubble size
-
-    fig = px.scatter(
-    df,
-    x="Employment, 2023",
-    y="Percent change, 2023-33",
-    size="Normalized size",
-    hover_name="Occupation",
-    title="2023 Employment vs. Growth Rate (Normalized Bubble Size)",
-    labels={
-        "Employment, 2023": "Employment in 2023",
-        "Percent change, 2023-33": "Percent Change (2023–2033)",
-        "Projected employment, 2033": "2033 Employment"
-    },
-    size_max=60  # still useful to cap largest bubble
-)
-    st.plotly_chart(fig, use_container_width=True)
-
-
-###########################################################################################################################################
-def clean_employment_data(file_path):
-    df = pd.read_csv(file_path)
-
-    def clean_col(col):
-        col = col.replace('\xa0', ' ')
-        col = col.replace('–', '-')
-        col = col.strip()
-        return col
-
-    df.columns = [clean_col(col) for col in df.columns]
-
-    # Drop rows missing growth data
-    df = df.dropna(subset=['Percent change, 2023-33'])
-
-    # Drop the "Total, all occupations" row
-    df = df[df["Occupation"] != "Total, all occupations"]
-
-    # Convert numeric columns that may have commas
-    cols_to_convert = [
-        "Employment, 2023",
-        "Percent change, 2023-33",
-        "Projected employment, 2033"
-    ]
-
-    for col in cols_to_convert:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.replace(",", "")
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    return df
-    
-############################################################################################################################################################################
-def s2():
-    st.header("Countries Leading the AI Revolution")
-    st.subheader("Use the radio buttons below to switch between different global metrics related to AI and automation.")
-
-# --- Load Patents Dataset ---
-    patents_df = pd.read_csv("artificial-intelligence-patents-submitted-per-million.csv")
-
-# Clean and standardize column names
-    patents_df = patents_df.rename(columns={
-        'Entity': 'Country',
-        'Patent applications per 1 million people - Field: All': 'Value'
-    })
-
-# Drop NaNs and filter recent years
-    patents_df = patents_df.dropna(subset=['Value'])
-
-
-
-    investment_df = pd.read_csv("private-investment-in-artificial-intelligence-cset.csv")
-# Clean and standardize column names
-    investment_df = investment_df.rename(columns={
-        'Entity': 'Country',
-        'Estimated investment - Field: All': 'Value'
-    })
-
-
-    robots_df = pd.read_csv("industrial-robots-annual-installations-total-operational.csv")
-
-# --- Radio Button UI ---
-    dataset_choice = st.radio(
-        "Select dataset to view:",
-        ('AI Patent Applications', 'Private Investment in AI')
-    )
-
-# --- Select dataset to visualize ---
-    if dataset_choice == 'AI Patent Applications':
-        display_df = patents_df
-        title = f"AI-Related Patent Applications per Million"
-    else:
-        display_df = investment_df
-        title = "Private Investment in AI by Country"
-
-    available_years = sorted(display_df['Year'].dropna().unique())
-    selected_year = st.slider("Select Year", int(min(available_years)), int(max(available_years)), int(max(available_years)))
-
-    # --- Filter by selected year ---
-    year_df = display_df[display_df['Year'] == selected_year]
-
-    vmin = year_df['Value'].min()
-    vmax = year_df['Value'].max()
-
-# --- Plot Heatmap ---
-    fig = px.choropleth(
-         year_df,
-        locations="Country",
-        locationmode="country names",
-        color="Value",
-        color_continuous_scale="Reds",
-        range_color=(vmin, vmax),
-        title=f"{title} ({selected_year})"
-    )
-
-    st.plotly_chart(fig, use_container_width=True, height=1000)
-###########################################################################################################################################
-def s2_1():
-    st.subheader("America has been dominating the global AI race, however China is quickly catching up.")
-    df = pd.read_csv("CHINA-VS-USA.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    # Calculate stats
-    max_gap = df["Performance gap"].max()
-    min_gap = df["Performance gap"].min()
-    median_gap = df["Performance gap"].median()
-
-    # Get the corresponding rows for annotations
-    max_row = df[df["Performance gap"] == max_gap].iloc[0]
-    min_row = df[df["Performance gap"] == min_gap].iloc[0]
-    med_row = df[df["Performance gap"] == median_gap].iloc[0] if median_gap in df["Performance gap"].values else df.iloc[len(df)//2]
-
-    # Create figure
-    fig = go.Figure()
+# Per-stage timings of each rerun in the sidebar: ?perf=1 or DECK_PERF=1
+perf_panel = st.query_params.get("perf") == "1" or os.environ.get("DECK_PERF") == "1"
 
-    # China line
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["China model score"],
-        mode='lines+markers', name="China Model",
-        line=dict(color="red")
-    ))
 
-    # U.S. line
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["U.S. model score"],
-        mode='lines+markers', name="U.S. Model",
-        line=dict(color="blue")
-    ))
-
-    # Shaded gap area
-    fig.add_trace(go.Scatter(
-        x=pd.concat([df["Date"], df["Date"][::-1]]),
-        y=pd.concat([df["China model score"], df["U.S. model score"][::-1]]),
-        fill="toself",
-        fillcolor="rgba(100,100,200,0.2)",
-        line=dict(color="rgba(255,255,255,0)"),
-        hoverinfo="skip",
-        name="Performance Gap"
-    ))
-
-    # Add annotations for min, max, and median
-    for row, label, color in zip(
-        [max_row, min_row, med_row],
-        ["Max Gap", "Min Gap", "Median Gap"],
-        ["purple", "green", "orange"]
-    ):
-        fig.add_annotation(
-            x=row["Date"],
-            y=(row["China model score"] + row["U.S. model score"]) / 2,
-            text=f"{label}: {row['Performance gap']}",
-            showarrow=True,
-            arrowhead=1,
-            yshift=10,
-            font=dict(color=color, size=12),
-            bgcolor="white"
-        )
-
-    # Update layout
-    fig.update_layout(
-        title="China vs U.S. AI Model Scores (Performance Gap Highlighted)",
-        xaxis_title="Date",
-        yaxis_title="Model Score",
-        legend_title="Model",
-        hovermode="x unified"
-    )
-
-    # Show in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
 ############################################################################################################################################################################
-def s3():
-    st.title("Annual Industrial Robots Installed Over Time by Entity")
-    st.subheader("China has been dominating the automation sector for many years and will continue to do so if predictions are true.")
-# Load and clean data
-    df = pd.read_csv('annual-industrial-robots-installed.csv')
-    df = df[df['Entity'] != 'World']
-    df = df.sort_values('Year')
-
-# Identify unique entities and sorted years
-    entities = df['Entity'].unique()
-    years = sorted(df['Year'].unique())
-
-# Create initial empty traces for each entity
-    initial_traces = [
-        go.Scatter(x=[], y=[], mode='lines+markers', name=ent)
-        for ent in entities
-    ]
-
-# Build the figure with Play button
-    fig = go.Figure(
-        data=initial_traces,
-        layout=go.Layout(
-            xaxis=dict(range=[years[0], years[-1]], title='Year'),
-            yaxis=dict(
-                range=[
-                    df['Annual industrial robots installed'].min(),
-                    df['Annual industrial robots installed'].max()
-                ],
-                title='Robots Installed'
-            ),
-            updatemenus=[dict(
-                type='buttons',
-                showactive=False,
-                y=1.05,
-                x=1.15,
-                xanchor='right',
-                yanchor='top',
-                buttons=[dict(
-                    label='Play',
-                    method='animate',
-                    args=[None, {
-                        'frame': {'duration': 1000, 'redraw': True},
-                        'transition': {'duration': 300},
-                        'fromcurrent': True
-                    }]
-                )]
-            )]
-        ),
-        frames=[
-            go.Frame(
-                data=[
-                    go.Scatter(
-                        x=df[(df['Entity'] == ent) & (df['Year'] <= year)]['Year'],
-                        y=df[(df['Entity'] == ent) & (df['Year'] <= year)]['Annual industrial robots installed'],
-                        mode='lines+markers',
-                        name=ent
-                    )
-                    for ent in entities
-                ],
-                name=str(year)
-            )
-            for year in years
-        ]
-    )
-
-# Add slider below to show progress
-    fig.update_layout(
-        sliders=[dict(
-            steps=[
-                dict(
-                    method='animate',
-                    args=[[str(year)], {
-                        'mode': 'immediate',
-                        'frame': {'duration': 1000, 'redraw': True},
-                        'transition': {'duration': 300}
-                    }],
-                    label=str(year)
-                )
-                for year in years
-            ],
-            transition={'duration': 0},
-            x=0,
-            y=-0.1,
-            currentvalue={'prefix': 'Year: ', 'font': {'size': 16}},
-            len=1.0
-        )]
-    )
-
-    # Render in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-###########################################################################################################################################
-def s5():
-    st.header("Key Events Timeline (U.S. vs China)")
-    st.subheader("Throughout the years many events have shaped the global stage for the battle between these two superpowers for AI and automation supremacy. Hover over each block or click the drop down menus to see the biggest events.")
-    df = pd.read_csv("ai-race-timeline.csv")
-
-    df = df.sort_values("Year")
-
-    # Create datetime ranges for plotting
-    df["Start"] = pd.to_datetime(df["Year"], format="%Y")
-    df["End"] = df["Start"] + pd.Timedelta(days=365)
-
-
-    # === Plotly Timeline (Color by Type) ===
-    fig = px.timeline(
-        df,
-        x_start="Start",
-        x_end="End",
-        y="Country",
-        color="Type",  # Color by Type, not Country
-        hover_name="Event",
-        hover_data=["Country", "Impact", "Description"],
-        title=f"AI Timeline Events)"
-    )
-    fig.update_yaxes(autorange="reversed")
-    st.plotly_chart(fig, use_container_width=True)
-
-    # === Narrative Breakdown ===
-    st.subheader("Event Breakdown")
-    for _, row in df.iterrows():
-        with st.expander(f"{int(row['Year'])} – {row['Country']}: {row['Event']}"):
-            st.markdown(f"""
-            - **Type**: {row['Type']}
-            - **Impact**: {row['Impact']}
-            - **Description**: {row['Description']}
-            """)
-            ###########################################################################################################################################
-def s4():
-    df = pd.read_csv("AI-VS-Human.csv")
-    st.subheader("From humble beginnings AI is slowly becoming better than its creators at tasks given to it. The dotted black line is a human baseline.")
-
-    # Create line chart
-    fig = px.line(
-        df,
-        x="Year",
-        y="Perfomance relative to the human baseline (100%)",
-        color="Task",
-        markers=True,
-        title="AI Task Performance Over Time (Relative to Human Baseline = 100%)",
-        labels={"Perfomance relative to the human baseline (100%)": "Performance (%)", "Year": "Year", "Task": "Task"},
-    )
-
-    # Add horizontal baseline at 100%
-    fig.add_shape(
-        type="line",
-        x0=df["Year"].min(),
-        x1=df["Year"].max(),
-        y0=100,
-        y1=100,
-        line=dict(color="Black", dash="dash"),
-    )
-
-    fig.update_layout(legend_title="Task")
-
-    # Display in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-###########################################################################################################################################
-def s6():
-    st.header("Who’s Most at Risk? AI Job Threat Index")
-
-    # Load and clean data
-    df = pd.read_csv("My_Data.csv")
-    df.columns = [col.strip().replace(" ", "_") for col in df.columns]
-    df['AI_Impact'] = df['AI_Impact'].replace('%', '', regex=True).astype(int)
-
-    # --- Slider to filter by AI Impact threshold ---
-    min_impact = st.slider("Minimum AI Impact to show (Risk Chart)", 0, 100, 50)
-
-    # --- Toggle: Top vs Bottom jobs ---
-    view_mode = st.radio(
-        "Choose job list view:",
-        ["Top 15 Most At-Risk", "Bottom 15 Least At-Risk"]
-    )
-
-    if view_mode == "Top 15 Most At-Risk":
-        filtered_df = df[df["AI_Impact"] >= min_impact]
-        risk_df = filtered_df.sort_values("AI_Impact", ascending=False).head(15)
-        chart_title = f"Top 15 Jobs with AI Impact ≥ {min_impact}%"
-        color_scale = "Reds"
-    else:
-        risk_df = df.sort_values("AI_Impact", ascending=True).head(15)
-        chart_title = "15 Jobs Least Affected by AI"
-        color_scale = "Greens"
-
-    # --- Chart: Risk by Job Title ---
-    st.subheader("Job-Level AI Risk")
-    fig1 = px.bar(
-        risk_df,
-        x="AI_Impact",
-        y="Job_titiles",
-        orientation="h",
-        labels={"AI_Impact": "AI Impact (%)", "Job_titiles": "Job Title"},
-        title=chart_title,
-        color="AI_Impact",
-        color_continuous_scale=color_scale
-    )
-    fig1.update_layout(yaxis=dict(categoryorder='total ascending'))
-    st.plotly_chart(fig1, use_container_width=True)
+def load_report():
+    # Markdown summary of which datasets each slide has loaded in this server
+    # process, from where and how long each took
+    loaded = {}
+    for record in datasets.loads():
+        loaded.setdefault(record["for"], []).append(record)
+
+    lines = []
+    report = warmup.report()
+    if report is not None:
+        lines.append(f"**Warm-up**: {report['figures']} figures in {report['seconds']:.2f} s ({report['workers']} workers)")
+    for record in watcher.reloads():
+        lines.append(f"**Reloaded** {record['name']}: {record['ms']:.1f} ms, {record['figures']} cached figures dropped")
+    for title in slides:
+        lines.append(f"**{title}**")
+        for record in loaded.get(title, []):
+            flag = "" if record["name"] in slide_datasets[title] else " (not declared)"
+            lines.append(f"- {record['name']}: {record['ms']:.1f} ms from {record['source']}{flag}")
+        own = {record["name"] for record in loaded.get(title, [])}
+        loaded_anywhere = [name for name in slide_datasets[title] if datasets.is_loaded(name) or database.is_ready(name)]
+        shared = [name for name in loaded_anywhere if name not in own]
+        pending = [name for name in slide_datasets[title] if name not in loaded_anywhere]
+        if shared:
+            lines.append(f"- shared with another slide: {', '.join(shared)}")
+        if pending:
+            lines.append(f"- not loaded yet: {', '.join(pending)}")
+    return "\n".join(lines)
+
+
+def perf_report(events, rerun_ms):
+    # Markdown list of the stages traced during one rerun, nested as they ran
+    sent = sum(event["bytes"] for event in events if event["stage"] == "payload")
+    lines = [f"**Rerun**: {rerun_ms:.1f} ms, {sent / 1024:.1f} KB of charts sent", ""]
+    for event in events:
+        indent = "    " * event["depth"]
+        if event["stage"] == "payload":
+            line = f"{indent}- payload {event['label']}: {event['bytes'] / 1024:.1f} KB"
+            if event.get("raw_bytes"):
+                line += f" ({event['raw_bytes'] / 1024:.1f} KB as built)"
+            lines.append(line)
+        else:
+            line = f"{indent}- {event['stage']} {event['label']}: {event['ms']:.1f} ms"
+            if event["self_ms"] < event["ms"] - 0.05:
+                line += f" ({event['self_ms']:.1f} ms self)"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def profile_report(profiler, limit=25):
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
 
-    # --- Chart: AI Impact by Industry Domain ---
-    st.subheader("Average AI Impact by Industry")
-    domain_avg = df.groupby("Domain")["AI_Impact"].mean().reset_index().sort_values("AI_Impact", ascending=False)
-
-    fig2 = px.bar(
-        domain_avg,
-        x="Domain",
-        y="AI_Impact",
-        labels={"AI_Impact": "Average AI Impact (%)"},
-        color="AI_Impact",
-        color_continuous_scale="Oranges",
-        title="Industry-Wide Vulnerability to AI"
-    )
-    st.plotly_chart(fig2, use_container_width=True)
-
-    # --- Selectbox to Search Job ---
-    st.subheader("Look Up Your Job Title")
-    job_selected = st.selectbox("Select a job title:", sorted(df["Job_titiles"].unique()))
-    job_row = df[df["Job_titiles"] == job_selected].iloc[0]
-
-    st.markdown(f"""
-    **Job Title**: {job_row['Job_titiles']}  
-    **AI Impact**: {job_row['AI_Impact']}%  
-    **# of Tasks**: {job_row['Tasks']}  
-    **# of AI Models**: {job_row['AI_models']}  
-    **AI Workload Ratio**: {job_row['AI_Workload_Ratio']}  
-    **Domain**: {job_row['Domain']}
-    """)
-    ###########################################################################################################################################
-def s7():
-
-
-    ai = pd.read_csv('The Rise Of Artificial Intellegence2.csv')
-    st.subheader("With billions being funnelled into AI, many organizations are using AI and it continues to increase every year.")
-
-    ai['Organizations Using AI'] = ai['Organizations Using AI'].str.replace('%','')
-    ai['Organizations Planning to Implement AI'] = ai['Organizations Planning to Implement AI'].str.replace('%','')
-    ai['Organizations Believing AI Provides Competitive Edge'] = ai['Organizations Believing AI Provides Competitive Edge'].str.replace('%','')
-    ai['Medical Professionals Using AI for Diagnosis'] = ai['Medical Professionals Using AI for Diagnosis'].str.replace('%','')
-    ai['Global Expectation for AI Adoption (%)'] = ai['Global Expectation for AI Adoption (%)'].str.replace('%','')
-    ai['Expected Increase in Employee Productivity Due to AI (%)'] = ai['Expected Increase in Employee Productivity Due to AI (%)'].str.replace('%','')
-    ai['Net Job Loss in the US'] = ai['Net Job Loss in the US'].str.replace('%','')
-
-
-    fig = px.line(
-        ai,
-        x = 'Year',
-        y = ['AI Software Revenue(in Billions)',
-         'Global AI Market Value(in Billions)'],
-        markers = True,
-        title = 'The Value of Aritifical Intelligence'
-    )
-
-    fig.update_layout(
-        yaxis_title = 'Value (Billions $)',
-        yaxis_range = [0,2000]
-    )
-
-    st.plotly_chart(fig)
-
-    fig1 = px.line(
-        ai,
-        x = 'Year',
-        y = ['Organizations Using AI',
-        'Organizations Planning to Implement AI',
-        'Medical Professionals Using AI for Diagnosis',
-        'Expected Increase in Employee Productivity Due to AI (%)'],
-        title = 'AI in the Field',
-        markers = True
-    )
-
-    fig1.update_layout(
-        yaxis_title = 'Percentage (%)',
-        yaxis_range = [0,70]
-    )
-
-    st.plotly_chart(fig1)
-
-
-def load_data():
-    df = pd.read_csv('The Rise Of Artificial Intellegence2.csv')
-    df = df.sort_values('Year')
-    # Convert percent strings → floats
-    pct_cols = [
-        'Organizations Planning to Implement AI',
-        'Organizations Using AI',
-        'Global Expectation for AI Adoption (%)'
-    ]
-    for col in pct_cols:
-        df[col] = df[col].str.rstrip('%').astype(float)
-    return df
-
-def s8():
-    df       = load_data()
-    years    = df['Year'].astype(str)
-    planning = df['Organizations Planning to Implement AI']
-    using    = df['Organizations Using AI']
-    expect   = df['Global Expectation for AI Adoption (%)']
-    st.subheader("Companies are deciding that it is time to move from human powered labor to mechanical labor.")
-
-    # 2. UI selector
-    choice = st.radio(
-        "Choose a chart:",
-        ("Implementation & Adoption", "Expectation ")
-    )
-
-    if choice == "Implementation & Adoption":
-        # 3a. Grouped bar chart (side-by-side)
-        x     = range(len(years))
-        width = 0.4
-
-        fig, ax = plt.subplots()
-        ax.bar([i - width/2 for i in x], planning, width, label='Planning to Implement AI')
-        ax.bar([i + width/2 for i in x], using,    width, label='Using AI ')
-
-        # 4a. Styling
-        ax.set_xticks(x)
-        ax.set_xticklabels(years, rotation=45)
-        ax.set_ylim(0, 100)  # clamp to 0–100%
-        ax.set_xlabel('Year')
-        ax.set_ylabel('Organizations (%)')
-        ax.set_title('Percentage of Organizations Planning vs. Using AI')
-        ax.legend()
-        plt.tight_layout()
-        st.pyplot(fig)
-
-    else:
-        # 3b. Simple line chart
-        fig, ax = plt.subplots()
-        ax.plot(years, expect, marker='o', linestyle='-', label='Global Expectation for AI Adoption ')
-
-        # 4b. Styling
-        ax.set_xticklabels(years, rotation=45)
-        ax.set_ylim(0, 100)
-        ax.set_xlabel('Year')
-        ax.set_ylabel('Expectation (%)')
-        ax.set_title('Global Expectation for AI Adoption by Year')
-        ax.legend()
-        plt.tight_layout()
-        st.pyplot(fig)
 ############################################################################################################################################################################
-if slide == "Layoffs and Workforce Dynamics":
-    s1()
-    s1_1('employment-projections.csv', 10)
-    s1_2('employment-projections.csv')
-elif slide == "Countries Leading the AI Revolution":
-    s2()
-    s2_1()
-elif slide == "Annual Industrial Robots Installed":
-    s3()
-    s8()
-elif slide == "AI Development and Prevalence":
-    s7()
-    s4()
-elif slide == "Jobs and Industries Most at Risk":
-    s6()
-elif slide == "Key Events Timeline (U.S. vs China)":
-    s5()
+def show_slide(slide):
+    with metrics.rerun(slide), datasets.loading_for(slide):
+        deck.get(slide).render()
+
+
+if perf_panel:
+    # The click reruns the script, and that rerun is the one profiled
+    profiler = cProfile.Profile() if st.sidebar.button("Profile this rerun (cProfile)") else None
+    start = time.perf_counter()
+    with timing.trace() as events:
+        if profiler is not None:
+            profiler.runcall(show_slide, slide)
+        else:
+            show_slide(slide)
+    rerun_ms = (time.perf_counter() - start) * 1000
+
+    with st.sidebar.expander("Performance (last full rerun)", expanded=True):
+        st.markdown(perf_report(events, rerun_ms))
+        if profiler is not None:
+            st.code(profile_report(profiler), language=None)
+else:
+    show_slide(slide)
+
+with st.sidebar.expander("Data loading report"):
+    st.markdown(load_report())
 
 # --- Next Button ---
 current_index = slides.index(slide)
 if current_index < len(slides) - 1:
+    # Warm the next slide while this one is being read
+    next_slide = slides[current_index + 1]
+    prefetch.slide(next_slide, slide_datasets[next_slide], deck.get(next_slide).calls)
+
     if st.button("Next"):
         st.session_state.current_slide = slides[current_index + 1]
         st.rerun()
@@ -0,0 +1,119 @@
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+import persist
+import schema
+
+# Compiles the CSV folder into typed Arrow snapshots so a cold start does not
+# have to parse percent strings, comma thousands and odd headers again. The
+# column types come from schema.py.
+#
+#   python ingest.py            # rebuild every snapshot
+#   python ingest.py jobs ...   # rebuild only the named datasets
+#   python ingest.py --sqlite   # bring the SQLite tables up to date instead (database.py)
+#
+# The registry in datasets.py memory-maps a snapshot when its recorded source
+# mtime/size, schema and code version (this file and schema.py) still match,
+# and falls back to the CSV otherwise. A snapshot that can't be read (e.g.
+# truncated by a crash mid-write elsewhere) is rebuilt from the CSV.
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+# Files whose edits invalidate every snapshot
+SNAPSHOT_CODE = ("schema.py", "ingest.py")
+
+log = logging.getLogger(__name__)
+
+############################################################################################################################################################################
+def snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, name + ".arrow")
+
+
+def write_snapshot(name, df, stamp, fingerprint):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"source_mtime_ns"] = str(stamp[0]).encode()
+    metadata[b"source_size"] = str(stamp[1]).encode()
+    metadata[b"schema"] = fingerprint.encode()
+    metadata[b"code"] = persist.code_version(SNAPSHOT_CODE).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = snapshot_path(name) + ".tmp"
+    # Uncompressed IPC file so readers can memory-map it
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, snapshot_path(name))
+
+
+def read_snapshot(name, stamp, fingerprint):
+    # Returns None when there is no snapshot or it was built from another
+    # version of the CSV, of its schema or of the code
+    try:
+        source = pa.memory_map(snapshot_path(name), "r")
+    except FileNotFoundError:
+        return None
+
+    try:
+        with source:
+            reader = pa.ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            built_from = (
+                int(metadata.get(b"source_mtime_ns", b"-1")),
+                int(metadata.get(b"source_size", b"-1")),
+            )
+            if built_from != stamp or metadata.get(b"schema") != fingerprint.encode():
+                return None
+            if metadata.get(b"code") != persist.code_version(SNAPSHOT_CODE).encode():
+                return None
+            return reader.read_all().to_pandas()
+    except (pa.ArrowInvalid, OSError) as e:
+        log.warning("snapshot of %s is unreadable (%s); rebuilding it from the CSV", name, e)
+
+    try:
+        return build(name)
+    except OSError:
+        log.exception("rebuilding the snapshot of %s failed; reading the CSV", name)
+        return None
+
+
+def build(name):
+    import datasets
+
+    file_name = datasets.DATASETS[name][0]
+    info = os.stat(datasets.path(name))
+    stamp = (info.st_mtime_ns, info.st_size)
+    df = schema.apply(file_name, pd.read_csv(datasets.path(name)))
+    write_snapshot(name, df, stamp, schema.fingerprint(file_name))
+    return df
+
+
+def main(names):
+    import datasets
+
+    if "--sqlite" in names:
+        return main_sqlite([name for name in names if name != "--sqlite"])
+    for name in names or datasets.DATASETS:
+        start = time.perf_counter()
+        df = build(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{name:<14} {len(df):>6} rows  {elapsed:7.1f} ms  -> {snapshot_path(name)}")
+
+
+def main_sqlite(names):
+    import database
+
+    for name in names or database.TABLES:
+        start = time.perf_counter()
+        database.ensure(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{name:<14} {elapsed:7.1f} ms  -> {database.DB_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
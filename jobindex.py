@@ -0,0 +1,124 @@
+import bisect
+import re
+
+import database
+import datasets
+
+# Lookups for the AI Job Threat Index (s6), built once per version of
+# My_Data.csv. The rows themselves stay in SQLite (database.py):
+#   - top/bottom-N under a threshold is an index range on AI_Impact
+#   - the job lookup box is an index lookup on the title
+# and only what every keystroke needs is kept in memory:
+#   - the per-Domain average, materialized once
+#   - a prefix/token search over the distinct job titles for the type-ahead box
+
+SEARCH_LIMIT = 20
+COLUMNS = ["Job_titiles", "AI_Impact", "Tasks", "AI_models", "AI_Workload_Ratio", "Domain"]
+
+
+class JobIndex:
+    def __init__(self):
+        self.titles = database.distinct("jobs", "Job_titiles")
+        self.search = TitleSearch(self.titles)
+
+        self.domain_avg = (
+            database.aggregate("jobs", "Domain", "AI_Impact")
+            .sort_values("AI_Impact", ascending=False)
+        )
+
+    def top(self, n, min_impact=None):
+        # Highest-impact n rows with AI_Impact >= min_impact, highest first
+        # (ties: later rows of the file first)
+        where, params = (None, ()) if min_impact is None else ('"AI_Impact" >= ?', (min_impact,))
+        return database.select("jobs", COLUMNS, where, params, order_by='"AI_Impact" DESC, rowid DESC', limit=n)
+
+    def bottom(self, n):
+        # Lowest-impact n rows, lowest first
+        return database.select("jobs", COLUMNS, order_by='"AI_Impact", rowid', limit=n)
+
+    def lookup(self, title):
+        # First row for a title, as a dict; None for unknown titles
+        rows = database.select("jobs", COLUMNS, '"Job_titiles" = ?', (title,), order_by="rowid", limit=1)
+        return rows.iloc[0].to_dict() if len(rows) else None
+
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class TitleSearch:
+    # Two structures over the (alphabetically sorted) titles:
+    #   - lowercased titles in sorted order, so "titles starting with q" is a
+    #     bisect followed by a short scan
+    #   - a token -> title ids inverted index with its tokens kept sorted, so
+    #     "data ana" finds "Senior Data Analyst" by intersecting the postings
+    #     of every token starting with "data" and with "ana"
+    def __init__(self, titles):
+        self.titles = titles
+        keyed = sorted((title.lower(), i) for i, title in enumerate(titles))
+        self.prefix_keys = [key for key, _ in keyed]
+        self.prefix_ids = [i for _, i in keyed]
+
+        postings = {}
+        for i, title in enumerate(titles):
+            for token in set(tokenize(title)):
+                postings.setdefault(token, []).append(i)
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+
+    def _prefix_matches(self, query):
+        # Walk from the bisect point without slicing: only the matching keys
+        # are visited, however long the list is
+        start = bisect.bisect_left(self.prefix_keys, query)
+        for j in range(start, len(self.prefix_keys)):
+            if not self.prefix_keys[j].startswith(query):
+                break
+            yield self.prefix_ids[j]
+
+    def _token_matches(self, token):
+        ids = set()
+        start = bisect.bisect_left(self.tokens, token)
+        for j in range(start, len(self.tokens)):
+            if not self.tokens[j].startswith(token):
+                break
+            ids.update(self.postings[j])
+        return ids
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        query = " ".join(query.lower().split())
+        if not query:
+            return self.titles[:limit]
+
+        # Titles that start with the query come first, alphabetically
+        found = []
+        for i in self._prefix_matches(query):
+            found.append(i)
+            if len(found) == limit:
+                return [self.titles[i] for i in found]
+
+        # Then titles where every query word starts one of the title's words
+        query_tokens = tokenize(query)
+        if query_tokens:
+            candidates = sorted((self._token_matches(token) for token in query_tokens), key=len)
+            matched = set.intersection(*candidates).difference(found)
+            found.extend(sorted(matched)[:limit - len(found)])
+
+        return [self.titles[i] for i in found]
+
+
+# version of My_Data.csv -> its JobIndex (only the latest is kept)
+_indexes = {}
+
+
+def get():
+    version = datasets.version("jobs")
+    index = _indexes.get(version)
+    if index is None:
+        index = JobIndex()
+        _indexes.clear()
+        _indexes[version] = index
+    return index
+
+
+def clear():
+    _indexes.clear()
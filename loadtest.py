@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Concurrent-session load test for the deck, run against a real Streamlit
+# server over its websocket protocol (what a browser tab does).
+#
+#   python loadtest.py --sessions 25 --loops 2
+#   python loadtest.py --url ws://localhost:8501 --pid 1234
+#
+# Without --url a server is started on a free local port and stopped at the
+# end. Each simulated viewer walks the whole deck with the "Next" button, drags
+# the s6 impact slider and the s2 year slider a few times on the way (those are
+# fragment reruns, as in the browser), then jumps back to the first slide from
+# the sidebar and starts over. The report gives throughput, p50/p95/p99 rerun
+# latency and the server's peak RSS (Linux, read from /proc).
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "groupapp.py")
+
+NEXT = "Next"
+NAVIGATION = "Go to"
+SLIDERS = ("Minimum AI Impact to show (Risk Chart)", "Select Year")
+SLIDER_MOVES = 3
+TIMEOUT = 120
+
+FINISHED_EARLY_FOR_RERUN = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_EARLY_FOR_RERUN")
+
+
+############################################################################################################################################################################
+class Session:
+    def __init__(self, ws, latencies, errors):
+        self.ws = ws
+        self.latencies = latencies
+        self.errors = errors
+        # label -> (element type, widget id, fragment id, element) from the last run
+        self.widgets = {}
+
+    async def rerun(self, changed=None, kind="full"):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        if changed is not None:
+            msg.rerun_script.widget_states.widgets.append(changed)
+            fragment_id = self.widgets_by_id.get(changed.id)
+            if fragment_id:
+                msg.rerun_script.fragment_id = fragment_id
+                kind = "fragment"
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+
+        widgets = {}
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self.ws.recv(), TIMEOUT))
+            what = reply.WhichOneof("type")
+            if what == "new_session":
+                # A click that triggers st.rerun finishes early and starts over;
+                # only the widgets of the last run are on the page
+                widgets = {}
+            elif what == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element_type = reply.delta.new_element.WhichOneof("type")
+                element = getattr(reply.delta.new_element, element_type)
+                if element_type == "exception":
+                    self.errors.append(element.message)
+                widget_id = getattr(element, "id", "")
+                if widget_id:
+                    label = getattr(element, "label", element_type)
+                    widgets[label] = (element_type, widget_id, reply.delta.fragment_id, element)
+            elif what == "script_finished" and reply.script_finished != FINISHED_EARLY_FOR_RERUN:
+                break
+
+        self.latencies.append((kind, time.perf_counter() - start))
+        if kind == "fragment":
+            self.widgets.update(widgets)
+        else:
+            self.widgets = widgets
+
+    @property
+    def widgets_by_id(self):
+        return {widget_id: fragment_id for _, widget_id, fragment_id, _ in self.widgets.values()}
+
+    async def move_slider(self, label, rng):
+        _, widget_id, _, element = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        steps = int((element.max - element.min) / (element.step or 1))
+        state.double_array_value.data.append(element.min + rng.randint(0, steps) * (element.step or 1))
+        await self.rerun(state)
+
+    async def click(self, label):
+        await self.rerun(WidgetState(id=self.widgets[label][1], trigger_value=True))
+
+    async def go_to_first_slide(self):
+        # Radio values go over the wire as the chosen option's label
+        _, widget_id, _, element = self.widgets[NAVIGATION]
+        await self.rerun(WidgetState(id=widget_id, string_value=element.options[0]))
+
+
+async def viewer(url, loops, think, seed, latencies, errors):
+    rng = random.Random(seed)
+    async with websockets.connect(url + "/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        session = Session(ws, latencies, errors)
+        await session.rerun()
+        for loop in range(loops):
+            while True:
+                for label in SLIDERS:
+                    if label in session.widgets:
+                        for _ in range(SLIDER_MOVES):
+                            await asyncio.sleep(think)
+                            await session.move_slider(label, rng)
+                if NEXT not in session.widgets:
+                    break
+                await asyncio.sleep(think)
+                await session.click(NEXT)
+            if loop < loops - 1:
+                await session.go_to_first_slide()
+
+
+############################################################################################################################################################################
+def rss_kb(pid, field="VmRSS"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def sample_rss(pid, peak, stop):
+    while not stop.is_set():
+        rss = rss_kb(pid)
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        await asyncio.sleep(0.1)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP,
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not come up")
+
+
+def percentiles(values):
+    if len(values) < 2:
+        return {"p50": values[0] * 1000 if values else None, "p95": None, "p99": None}
+    cuts = statistics.quantiles(values, n=100)
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+async def run(url, pid, sessions, loops, think):
+    latencies, errors = [], []
+    peak = [0]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, peak, stop)) if pid else None
+    baseline = rss_kb(pid) if pid else None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(viewer(url, loops, think, seed, latencies, errors) for seed in range(sessions)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    if sampler:
+        await sampler
+    failures = [repr(r) for r in results if isinstance(r, Exception)]
+
+    report = {
+        "sessions": sessions,
+        "loops": loops,
+        "reruns": len(latencies),
+        "seconds": elapsed,
+        "reruns_per_second": len(latencies) / elapsed if elapsed else None,
+        "latency_ms": percentiles([t for _, t in latencies]),
+        "full_rerun_latency_ms": percentiles([t for kind, t in latencies if kind == "full"]),
+        "fragment_rerun_latency_ms": percentiles([t for kind, t in latencies if kind == "fragment"]),
+        "baseline_rss_mb": baseline / 1024 if baseline else None,
+        "peak_rss_mb": peak[0] / 1024 if pid else None,
+        "app_exceptions": len(errors),
+        "exception_messages": sorted(set(errors)),
+        "failed_sessions": failures,
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for groupapp.py")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent viewers")
+    parser.add_argument("--loops", type=int, default=1, help="times each viewer walks the deck")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds between a viewer's actions")
+    parser.add_argument("--url", help="ws://host:port of a running server (default: start one)")
+    parser.add_argument("--pid", type=int, help="server pid to watch for RSS when using --url")
+    parser.add_argument("--out", help="also write the report as JSON here")
+    args = parser.parse_args()
+
+    server = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url, pid = f"ws://127.0.0.1:{port}", server.pid
+
+    try:
+        report = asyncio.run(run(url.rstrip("/"), pid, args.sessions, args.loops, args.think))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import bisect
+import contextlib
+import http.server
+import logging
+import os
+import threading
+import time
+
+import datasets
+import figcache
+import persist
+
+# Ops metrics for the deck in Prometheus text format, collected in-process
+# and exposed without any outside service:
+#
+#   DECK_METRICS_PORT=9108   serve them at http://127.0.0.1:9108/metrics
+#   DECK_METRICS_FILE=path   rewrite this file at most every FLUSH_INTERVAL s
+#                            (e.g. for node_exporter's textfile collector)
+#
+# groupapp.py wraps every slide render in rerun(), full reruns and fragment
+# reruns alike. Cache and dataset numbers are read from figcache, persist and
+# datasets when the metrics are rendered.
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FLUSH_INTERVAL = 5.0
+HOST = os.environ.get("DECK_METRICS_HOST", "127.0.0.1")
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# (slide, kind) -> {"count", "errors", "sum", "buckets": [count per BUCKETS]}
+_reruns = {}
+_state = {"server": None, "flushed": 0.0}
+
+
+@contextlib.contextmanager
+def rerun(slide, kind="full"):
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        observe(slide, kind, time.perf_counter() - start, failed)
+
+
+def observe(slide, kind, seconds, failed=False):
+    with _lock:
+        series = _reruns.setdefault((slide, kind), {
+            "count": 0, "errors": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS),
+        })
+        series["count"] += 1
+        series["errors"] += failed
+        series["sum"] += seconds
+        # Cumulative buckets are summed up when rendering
+        i = bisect.bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS):
+            series["buckets"][i] += 1
+    flush()
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return f"{name} {value}"
+    escaped = (str(val).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for val in labels.values())
+    return name + "{" + ",".join(f'{key}="{val}"' for key, val in zip(labels, escaped)) + "} " + str(value)
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS where /proc is missing (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def render():
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(_sample(name, labels, value) for labels, value in samples)
+
+    with _lock:
+        reruns = {key: dict(series, buckets=list(series["buckets"])) for key, series in _reruns.items()}
+
+    metric("deck_reruns_total", "counter", "Slide renders, full script reruns and fragment reruns.",
+           [({"slide": slide, "kind": kind}, s["count"]) for (slide, kind), s in reruns.items()])
+    metric("deck_rerun_errors_total", "counter", "Slide renders that raised.",
+           [({"slide": slide, "kind": kind}, s["errors"]) for (slide, kind), s in reruns.items()])
+
+    lines.append("# HELP deck_render_seconds Time to render a slide.")
+    lines.append("# TYPE deck_render_seconds histogram")
+    for (slide, kind), s in reruns.items():
+        running = 0
+        for bound, count in zip(BUCKETS, s["buckets"]):
+            running += count
+            lines.append(_sample("deck_render_seconds_bucket", {"slide": slide, "kind": kind, "le": bound}, running))
+        lines.append(_sample("deck_render_seconds_bucket", {"slide": slide, "kind": kind, "le": "+Inf"}, s["count"]))
+        lines.append(_sample("deck_render_seconds_sum", {"slide": slide, "kind": kind}, s["sum"]))
+        lines.append(_sample("deck_render_seconds_count", {"slide": slide, "kind": kind}, s["count"]))
+
+    cache = figcache.stats()
+    metric("deck_figcache_hits_total", "counter", "Figure cache hits.", [({}, cache["hits"])])
+    metric("deck_figcache_misses_total", "counter", "Figure cache misses.", [({}, cache["misses"])])
+    metric("deck_figcache_disk_hits_total", "counter", "Misses served from the on-disk cache.", [({}, cache["disk_hits"])])
+    metric("deck_figcache_evictions_total", "counter", "Figures evicted from the cache.", [({}, cache["evictions"])])
+    metric("deck_figcache_invalidations_total", "counter", "Figures dropped because a dataset they read was reloaded.", [({}, cache["invalidations"])])
+    metric("deck_figcache_hit_ratio", "gauge", "Figure cache hits / lookups since start.", [({}, cache["hit_ratio"])])
+    metric("deck_figcache_bytes", "gauge", "Serialized size of the cached figures.", [({}, cache["bytes"])])
+    metric("deck_figcache_entries", "gauge", "Figures in the cache.", [({}, cache["entries"])])
+    if persist.ENABLED:
+        metric("deck_disk_cache_bytes", "gauge", "Size of the on-disk cache (persist.py).", [({}, persist.size())])
+        metric("deck_disk_cache_limit_bytes", "gauge", "Size the on-disk cache is trimmed to.", [({}, persist.MAX_BYTES)])
+
+    loads = {}
+    for record in datasets.loads():
+        key = (record["name"], record["source"])
+        count, ms = loads.get(key, (0, 0.0))
+        loads[key] = (count + 1, ms + record["ms"])
+    metric("deck_dataset_loads_total", "counter", "Datasets parsed from disk.",
+           [({"dataset": name, "source": source}, count) for (name, source), (count, _) in sorted(loads.items())])
+    metric("deck_dataset_load_seconds_total", "counter", "Time spent loading datasets.",
+           [({"dataset": name, "source": source}, ms / 1000) for (name, source), (_, ms) in sorted(loads.items())])
+
+    rss = rss_bytes()
+    if rss is not None:
+        metric("process_resident_memory_bytes", "gauge", "Resident memory of the Streamlit server.", [({}, rss)])
+
+    return "\n".join(lines) + "\n"
+
+
+############################################################################################################################################################################
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start():
+    # Called on every script run; only the first one starts the server
+    port = os.environ.get("DECK_METRICS_PORT")
+    if not port:
+        return
+    with _lock:
+        if _state["server"] is not None:
+            return
+        try:
+            server = http.server.ThreadingHTTPServer((HOST, int(port)), _Handler)
+        except OSError as error:
+            log.warning("metrics endpoint not started on %s:%s: %s", HOST, port, error)
+            _state["server"] = False
+            return
+        threading.Thread(target=server.serve_forever, name="deck-metrics", daemon=True).start()
+        _state["server"] = server
+    log.info("serving metrics on http://%s:%s/metrics", HOST, port)
+
+
+def flush(force=False):
+    path = os.environ.get("DECK_METRICS_FILE")
+    if not path:
+        return
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _state["flushed"] < FLUSH_INTERVAL:
+            return
+        _state["flushed"] = now
+    # Write then rename, so a scraper never reads half a file. Called from
+    # rerun()'s finally: a file that can't be written must not fail the
+    # slide (or hide the slide's own exception), so it is only logged.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(render())
+        os.replace(tmp, path)
+    except OSError as error:
+        log.warning("metrics not written to %s: %s", path, error)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
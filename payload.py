@@ -0,0 +1,126 @@
+import base64
+import re
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Shrinks a Plotly figure before it is cached, since the cached Figure is
+# what st.plotly_chart serializes and sends on every rerun of every session.
+#
+# Plotly already sends numpy arrays as base64 typed arrays ("bdata") and
+# picks the smallest integer type for them. On top of that, in every trace
+# (and every animation frame's traces):
+#   - numeric lists and tuples become numpy arrays, so they are typed arrays too
+#   - whole-number floats up to 2**53 become the smallest integer type that
+#     holds them
+#   - other floats become float32 when that keeps them within FLOAT_RTOL,
+#     far beyond what any hover label or axis shows
+#   - customdata columns the hovertemplate doesn't reference are dropped (the
+#     deck doesn't use chart selections, the other reader of customdata)
+# The layout, template included, is left alone: Streamlit's chart theme
+# relies on it.
+
+FLOAT_RTOL = 1e-6
+# Shorter arrays aren't worth the base64 header
+MIN_LENGTH = 8
+
+INT_TYPES = (np.int8, np.int16, np.int32)
+# Largest magnitude below which every whole number is exact in a float64
+MAX_EXACT_INT = 2 ** 53
+CUSTOMDATA_REF = re.compile(r"%\{customdata(?:\[(\d+)\])?")
+
+
+def compact(fig):
+    spec = fig.to_dict()
+    for trace in spec.get("data", []):
+        _compact_trace(trace)
+    for frame in spec.get("frames", []):
+        for trace in frame.get("data", []):
+            _compact_trace(trace)
+    return go.Figure(spec)
+
+
+def _compact_trace(trace):
+    if _is_typed_array(trace.get("customdata")):
+        trace["customdata"] = _decode(trace["customdata"])
+    if "customdata" in trace:
+        _prune_customdata(trace)
+    for key, value in list(trace.items()):
+        if _is_typed_array(value):
+            value = _decode(value)
+        if isinstance(value, dict):
+            # marker.size, marker.color, error_y.array, ...
+            _compact_trace(value)
+        elif key != "customdata":
+            trace[key] = _compact_array(value)
+
+
+def _is_typed_array(value):
+    # fig.to_dict() already hands numpy arrays over as {"dtype", "bdata"}
+    return isinstance(value, dict) and "bdata" in value and "dtype" in value
+
+
+def _decode(value):
+    array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+    if "shape" in value:
+        shape = [int(n) for n in str(value["shape"]).split(",")]
+        array = array.reshape(shape)
+    return array
+
+
+def _compact_array(value):
+    if not isinstance(value, (list, tuple, np.ndarray)) or len(value) < MIN_LENGTH:
+        return value
+    array = np.asarray(value)
+    if array.dtype.kind == "b" or array.dtype.kind not in "iuf":
+        return value
+
+    if array.dtype.kind == "f":
+        finite = np.isfinite(array)
+        # Whole numbers go the integer route only while floats still hold
+        # them exactly (|x| <= 2**53), well inside int64
+        if (finite.all() and np.abs(array).max() <= MAX_EXACT_INT
+                and np.array_equal(array, np.round(array))):
+            array = array.astype(np.int64)
+        else:
+            as_float32 = array.astype(np.float32)
+            with np.errstate(over="ignore", invalid="ignore"):
+                close = np.isclose(as_float32, array, rtol=FLOAT_RTOL, atol=0, equal_nan=True)
+            return as_float32 if close.all() else array
+
+    low, high = array.min(), array.max()
+    for dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array
+
+
+def _prune_customdata(trace):
+    template = trace.get("hovertemplate")
+    if template is None:
+        template = ""
+    per_point = isinstance(template, (list, tuple, np.ndarray))
+    if per_point:
+        template = " ".join(str(t) for t in template)
+
+    references = CUSTOMDATA_REF.findall(template)
+    if not references:
+        del trace["customdata"]
+        return
+    if per_point or "" in references:
+        # One template per point, or %{customdata} as a whole: keep it as is
+        return
+
+    used = sorted({int(i) for i in references})
+    customdata = np.asarray(trace["customdata"], dtype=object)
+    if customdata.ndim != 2 or used == list(range(customdata.shape[1])):
+        return
+
+    renumber = {old: new for new, old in enumerate(used)}
+    trace["customdata"] = customdata[:, used]
+    trace["hovertemplate"] = re.sub(
+        r"%\{customdata\[(\d+)\]",
+        lambda m: "%{customdata[" + str(renumber[int(m.group(1))]) + "]",
+        trace["hovertemplate"],
+    )
@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import os
+import threading
+
+import pandas as pd
+import plotly
+import pyarrow as pa
+
+# On-disk cache of cleaned datasets and serialized figures, so a restarted
+# server answers its first requests from disk instead of recomputing.
+#
+# Entries are keyed by the SHA-256 of the source CSVs' contents (not their
+# mtimes, which a redeploy or checkout resets) and by a hash of the code that
+# produced them, so editing a cleaner or a figure builder retires old entries.
+# The directory is bounded: after each write the least recently used files
+# are deleted until it fits in MAX_BYTES.
+#
+#   DECK_DISK_CACHE=0        turn it off
+#   DECK_CACHE_DIR=path      where it lives (default .deckcache/ next to the app)
+#   DECK_CACHE_MB=n          size limit (default 256)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENABLED = os.environ.get("DECK_DISK_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("DECK_CACHE_DIR") or os.path.join(HERE, ".deckcache")
+MAX_BYTES = int(float(os.environ.get("DECK_CACHE_MB", "256")) * 1024 * 1024)
+
+# Modules whose code decides what a cleaned frame / a figure looks like
+FRAME_CODE = ("schema.py", "datasets.py")
+FIGURE_CODE = FRAME_CODE + ("figures.py", "frames.py", "jobindex.py", "database.py", "countrycube.py", "downsample.py", "payload.py", "figcache.py")
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# path -> ((mtime_ns, size), sha256), so unchanged files aren't hashed again
+_hashes = {}
+_code_versions = {}
+
+
+############################################################################################################################################################################
+def content_hash(path, stamp):
+    with _lock:
+        known = _hashes.get(path)
+    if known is not None and known[0] == stamp:
+        return known[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    with _lock:
+        _hashes[path] = (stamp, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def code_version(files):
+    with _lock:
+        version = _code_versions.get(files)
+    if version is None:
+        digest = hashlib.sha256(f"{pd.__version__} {pa.__version__} {plotly.__version__}".encode())
+        for name in files:
+            with open(os.path.join(HERE, name), "rb") as f:
+                digest.update(f.read())
+        version = digest.hexdigest()
+        with _lock:
+            _code_versions[files] = version
+    return version
+
+
+def key(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def frame_key(name, path, stamp):
+    return key(name, content_hash(path, stamp), code_version(FRAME_CODE))
+
+
+def figure_key(builder, args, sources):
+    # sources: (path, stamp) of every CSV the figure reads
+    hashes = tuple(content_hash(path, stamp) for path, stamp in sources)
+    return key(builder, args, hashes, code_version(FIGURE_CODE))
+
+
+def _path(kind, entry_key, suffix):
+    return os.path.join(CACHE_DIR, f"{kind}-{entry_key}{suffix}")
+
+
+############################################################################################################################################################################
+def read_frame(entry_key):
+    if not ENABLED:
+        return None
+    path = _path("frame", entry_key, ".arrow")
+    try:
+        with pa.memory_map(path, "r") as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    _touch(path)
+    return df
+
+
+def write_frame(entry_key, df):
+    if not ENABLED:
+        return
+    table = pa.Table.from_pandas(df)
+
+    def write(tmp_path):
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    write_file(_path("frame", entry_key, ".arrow"), write)
+
+
+def read_figure(entry_key):
+    # Figure JSON, or the PNG bytes of a raster chart; None if not on disk
+    if not ENABLED:
+        return None
+    path = _path("figure", entry_key, ".json")
+    if not os.path.exists(path):
+        path = _path("figure", entry_key, ".png")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    _touch(path)
+    return data.decode("utf-8") if path.endswith(".json") else data
+
+
+def write_figure(entry_key, data):
+    # `data` is figure JSON (str) or PNG bytes
+    if not ENABLED:
+        return
+    suffix = ".png" if isinstance(data, bytes) else ".json"
+    raw = data if isinstance(data, bytes) else data.encode("utf-8")
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+    write_file(_path("figure", entry_key, suffix), write)
+
+
+def _touch(path):
+    # Reads count as use for the LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def write_file(path, write, bounded=True):
+    # Write then rename so readers (other sessions or processes) never see
+    # half a file; a failed write just means no cache entry. `write` gets the
+    # temporary path to write to. Entries outside CACHE_DIR's own files (e.g.
+    # resolver.py's downloads) pass bounded=False to skip the eviction pass.
+    # Returns whether the file was written.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as error:
+        log.warning("could not write %s: %s", path, error)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    if bounded:
+        evict()
+    return True
+
+
+def evict(max_bytes=None):
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    info = entry.stat()
+                    entries.append((info.st_mtime_ns, info.st_size, entry.path))
+    except OSError:
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def size():
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            return sum(entry.stat().st_size for entry in it if entry.is_file())
+    except OSError:
+        return 0
@@ -0,0 +1,53 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+import datasets
+
+# Background warm-up of the slide after the one being viewed. Slides come in
+# a fixed order, so while someone reads slide k a worker thread loads slide
+# k+1's datasets and builds its default figures into the shared caches; the
+# rerun after "Next" then only finds cache hits.
+#
+# Set DECK_PREFETCH=0 to turn it off (bench.py does, so background work
+# doesn't leak into the numbers of the slide being measured).
+
+ENABLED = os.environ.get("DECK_PREFETCH", "1") != "0"
+WORKERS = 2
+
+log = logging.getLogger(__name__)
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="deck-prefetch")
+_lock = threading.Lock()
+# slide title -> future of its latest warm-up
+_pending = {}
+
+
+def slide(title, dataset_names, calls):
+    # Warm `title` in the background: load `dataset_names`, then run each
+    # (function, args) that `calls()` returns. Resolving them imports the
+    # slide's figure modules, so that is left to the worker too. A slide
+    # already being warmed isn't queued twice.
+    if not ENABLED:
+        return None
+    with _lock:
+        future = _pending.get(title)
+        if future is not None and not future.done():
+            return future
+        future = _pool.submit(_warm, title, dataset_names, calls)
+        _pending[title] = future
+    return future
+
+
+def _warm(title, dataset_names, calls):
+    # Loads made here show up under the slide in the data loading report
+    with datasets.loading_for(title):
+        try:
+            for name in dataset_names:
+                database.prepare(name)
+            for call, args in calls():
+                call(*args)
+        except Exception:
+            log.exception("prefetch of %r failed", title)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pandas as pd
+
+import persist
+
+# Where a data source actually gets read from: the deck's datasets (through
+# datasets.path) and the standalone pages that read a URL (futurejobs.py).
+#
+# raw.githubusercontent.com URLs of this project's own repository resolve to
+# the CSVs bundled next to the app, so nothing waits on (or fails without) the
+# network. Any other URL goes through a local HTTP cache: a copy younger than
+# TTL seconds is used as is; an older one is revalidated with If-None-Match /
+# If-Modified-Since and only downloaded again if it changed. If the server
+# can't be reached, the cached copy is used anyway.
+#
+#   DECK_HTTP_TTL=s          seconds before a cached download is revalidated (default 3600)
+#   DECK_HTTP_CACHE_DIR=path where downloads are kept (default .deckcache/http/)
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+# GitHub repositories whose files are bundled in DATA_DIR
+BUNDLED_REPOS = ("JunyiiBlvd/205_Final_Pro",)
+
+TTL = float(os.environ.get("DECK_HTTP_TTL", "3600"))
+CACHE_DIR = os.environ.get("DECK_HTTP_CACHE_DIR") or os.path.join(persist.CACHE_DIR, "http")
+TIMEOUT = 30
+
+log = logging.getLogger(__name__)
+
+# One lock per URL: a slow download only holds up other requests for the
+# same URL
+_lock = threading.Lock()
+_url_locks = {}
+
+
+def read_csv(source, **kwargs):
+    return pd.read_csv(resolve(source), **kwargs)
+
+
+def resolve(source, ttl=None, cache_dir=None):
+    # Local path to read `source` (a path or a URL) from
+    if not source.startswith(("http://", "https://")):
+        return source
+    local = bundled(source)
+    if local is not None:
+        return local
+    return fetch(source, ttl, cache_dir)
+
+
+def bundled(url):
+    # The bundled copy of a raw.githubusercontent.com/<owner>/<repo>/<ref>/<file>
+    # URL of one of BUNDLED_REPOS, or None
+    parts = urllib.parse.urlsplit(url)
+    if parts.netloc != "raw.githubusercontent.com":
+        return None
+    segments = parts.path.strip("/").split("/")
+    if len(segments) < 4 or "/".join(segments[:2]) not in BUNDLED_REPOS:
+        return None
+    local = os.path.join(DATA_DIR, urllib.parse.unquote(segments[-1]))
+    return local if os.path.isfile(local) else None
+
+
+############################################################################################################################################################################
+def fetch(url, ttl=None, cache_dir=None):
+    # Path of an up-to-date local copy of `url`
+    ttl = TTL if ttl is None else ttl
+    cache_dir = cache_dir or CACHE_DIR
+    name = hashlib.sha256(url.encode()).hexdigest()[:32]
+    body_path = os.path.join(cache_dir, name + ".body")
+    meta_path = os.path.join(cache_dir, name + ".json")
+
+    with _url_lock(url):
+        meta = _read_meta(meta_path) if os.path.isfile(body_path) else None
+        if meta is not None and time.time() - meta["fetched"] < ttl:
+            return body_path
+
+        request = urllib.request.Request(url)
+        if meta is not None:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                body = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and meta is not None:
+                meta["fetched"] = time.time()
+                _write(meta_path, json.dumps(meta).encode())
+                return body_path
+            if meta is None:
+                raise
+            log.warning("revalidating %s failed (%s); using the cached copy", url, error)
+            return body_path
+        except (urllib.error.URLError, OSError) as error:
+            if meta is None:
+                raise
+            log.warning("revalidating %s failed (%s); using the cached copy", url, error)
+            return body_path
+
+        if not _write(body_path, body):
+            raise OSError(f"could not cache {url} in {cache_dir}")
+        _write(meta_path, json.dumps({
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }).encode())
+        log.info("downloaded %s (%d bytes)", url, len(body))
+        return body_path
+
+
+def _url_lock(url):
+    with _lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+def _read_meta(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, data):
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+    return persist.write_file(path, write, bounded=False)
@@ -0,0 +1,117 @@
+import http.server
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+
+import resolver
+
+# Check of resolver.fetch's HTTP cache against a stand-in server on a local
+# port, so it runs offline:
+#
+#   python resolvercheck.py
+#
+# The server answers /data.csv with an ETag and Last-Modified (and 304 when
+# If-None-Match still matches), and /slow.csv the same way after SLOW_SECONDS.
+# Prints one line per check and exits 1 if any failed.
+
+SLOW_SECONDS = 2.0
+
+
+class Server:
+    def __init__(self):
+        self.body = b"a,b\n1,2\n"
+        self.etag = '"v1"'
+        self.requests = []
+        outer = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                outer.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.path == "/slow.csv":
+                    time.sleep(SLOW_SECONDS)
+                if self.headers.get("If-None-Match") == outer.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", outer.etag)
+                self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+                self.send_header("Content-Length", str(len(outer.body)))
+                self.end_headers()
+                self.wfile.write(outer.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="deck-resolver-")
+    server = Server()
+    url = server.url + "/data.csv"
+    results = []
+
+    def check(name, ok):
+        results.append(ok)
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+
+    try:
+        path = resolver.fetch(url, ttl=60, cache_dir=cache_dir)
+        check("first fetch downloads", read(path) == server.body and len(server.requests) == 1)
+
+        resolver.fetch(url, ttl=60, cache_dir=cache_dir)
+        check("within the TTL there is no request", len(server.requests) == 1)
+
+        path = resolver.fetch(url, ttl=0, cache_dir=cache_dir)
+        check("after the TTL If-None-Match is sent and a 304 served",
+              server.requests[-1] == ("/data.csv", '"v1"') and read(path) == server.body)
+
+        server.body, server.etag = b"a,b\n3,4\n", '"v2"'
+        path = resolver.fetch(url, ttl=0, cache_dir=cache_dir)
+        check("a changed ETag downloads the new body", read(path) == b"a,b\n3,4\n")
+
+        # A slow download of one URL doesn't hold up another URL
+        slow = threading.Thread(target=resolver.fetch, args=(server.url + "/slow.csv", 0, cache_dir))
+        slow.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        resolver.fetch(url, ttl=0, cache_dir=cache_dir)
+        check("another URL isn't blocked by a slow download", time.perf_counter() - start < SLOW_SECONDS / 2)
+        slow.join()
+
+        bundled = resolver.resolve("https://raw.githubusercontent.com/JunyiiBlvd/205_Final_Pro/main/My_Data.csv")
+        check("bundled URLs resolve to the local CSV", bundled == os.path.join(resolver.DATA_DIR, "My_Data.csv"))
+
+        server.stop()
+        path = resolver.fetch(url, ttl=0, cache_dir=cache_dir)
+        check("with the server down the cached copy is used", read(path) == b"a,b\n3,4\n")
+
+        try:
+            resolver.fetch(server.url + "/never.csv", ttl=0, cache_dir=cache_dir)
+            check("an uncached URL with the server down raises", False)
+        except (urllib.error.URLError, OSError):
+            check("an uncached URL with the server down raises", True)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import pandas as pd
+
+# Column types for every CSV shipped with the deck. apply() runs once at load
+# time (or when ingest.py builds a snapshot), so slides always receive numeric
+# percent/thousands columns, parsed dates and categorical labels.
+#
+#   PERCENT   "89.15%"                -> 89.15
+#   NUMBER    "1,692,100", "$0.70 "   -> 1692100, 0.7
+#   DATE      "2024-01"               -> datetime64
+#   CATEGORY  repeated labels         -> category
+#
+# Columns that are not listed keep whatever type read_csv gave them. Header
+# names are the normalized ones (see clean_col).
+
+PERCENT = "percent"
+NUMBER = "number"
+DATE = "date"
+CATEGORY = "category"
+
+SCHEMAS = {
+    "AI-VS-Human.csv": {
+        "Perfomance relative to the human baseline (100%)": PERCENT,
+        "Task": CATEGORY,
+    },
+    "CHINA-VS-USA.csv": {
+        "Date": DATE,
+    },
+    "Layoff_Trend_Analyzed_30_Years_Final.csv": {
+        "Industry_Focus": CATEGORY,
+    },
+    "My_Data.csv": {
+        "AI Impact": PERCENT,
+        "Domain": CATEGORY,
+    },
+    "The Rise Of Artificial Intellegence2.csv": {
+        "AI Adoption (%)": PERCENT,
+        "Organizations Using AI": PERCENT,
+        "Organizations Planning to Implement AI": PERCENT,
+        "Global Expectation for AI Adoption (%)": PERCENT,
+        "Estimated Jobs Eliminated by AI (millions)": PERCENT,
+        "Estimated New Jobs Created by AI (millions)": PERCENT,
+        "Net Job Loss in the US": PERCENT,
+        "Organizations Believing AI Provides Competitive Edge": PERCENT,
+        "Companies Prioritizing AI in Strategy": PERCENT,
+        "Marketers Believing AI Improves Email Revenue": PERCENT,
+        "Expected Increase in Employee Productivity Due to AI (%)": PERCENT,
+        "Americans Using Voice Assistants (%)": PERCENT,
+        "Medical Professionals Using AI for Diagnosis": PERCENT,
+        "Jobs at High Risk of Automation - Transportation & Storage (%)": PERCENT,
+        "Jobs at High Risk of Automation - Wholesale & Retail Trade": PERCENT,
+        "Jobs at High Risk of Automation - Manufacturing": PERCENT,
+    },
+    "ai-performance-knowledge-tests-vs-training-computation.csv": {
+        "Entity": CATEGORY,
+    },
+    "ai-race-timeline.csv": {
+        "Country": CATEGORY,
+        "Type": CATEGORY,
+        "Impact": CATEGORY,
+    },
+    "annual-industrial-robots-installed.csv": {
+        "Entity": CATEGORY,
+    },
+    "artificial-intelligence-patents-submitted-per-million.csv": {
+        "Entity": CATEGORY,
+    },
+    "cumulative-number-of-large-scale-ai-models-by-domain.csv": {
+        "Entity": CATEGORY,
+    },
+    "employment-projections.csv": {
+        "Employment, 2023": NUMBER,
+        "Projected employment, 2033": NUMBER,
+        "Change in employment, 2023-33": NUMBER,
+    },
+    "exponential-growth-of-computation-in-the-training-of-notable-ai-systems.csv": {
+        "Entity": CATEGORY,
+        "Day": DATE,
+    },
+    "industrial-robots-annual-installations-total-operational.csv": {
+        "Entity": CATEGORY,
+    },
+    "private-investment-in-artificial-intelligence-cset.csv": {
+        "Entity": CATEGORY,
+    },
+    "world-data-2023.csv": {
+        "Country": CATEGORY,
+        "Density (P/Km2)": NUMBER,
+        "Agricultural Land( %)": PERCENT,
+        "Land Area(Km2)": NUMBER,
+        "Armed Forces size": NUMBER,
+        "Co2-Emissions": NUMBER,
+        "CPI": NUMBER,
+        "CPI Change (%)": PERCENT,
+        "Forested Area (%)": PERCENT,
+        "Gasoline Price": NUMBER,
+        "GDP": NUMBER,
+        "Gross primary education enrollment (%)": PERCENT,
+        "Gross tertiary education enrollment (%)": PERCENT,
+        "Minimum wage": NUMBER,
+        "Out of pocket health expenditure": PERCENT,
+        "Population": NUMBER,
+        "Population: Labor force participation (%)": PERCENT,
+        "Tax revenue (%)": PERCENT,
+        "Total tax rate": PERCENT,
+        "Unemployment rate": PERCENT,
+        "Urban_population": NUMBER,
+    },
+}
+
+
+############################################################################################################################################################################
+def clean_col(col):
+    col = col.replace('\ufeff', '')
+    col = col.replace('\xa0', ' ')
+    col = col.replace('–', '-')
+    # Collapse line breaks and repeated spaces inside quoted headers
+    col = " ".join(col.split())
+    return col
+
+
+def _strip(values, chars):
+    # Vectorized removal of formatting characters before to_numeric
+    if values.dtype.kind in "biuf":
+        return values
+    return values.str.replace(chars, "", regex=True).str.strip()
+
+
+def parse_percent(values):
+    return pd.to_numeric(_strip(values, r"%"), errors="coerce")
+
+
+def parse_number(values):
+    return pd.to_numeric(_strip(values, r"[,$]"), errors="coerce")
+
+
+def parse_date(values):
+    return pd.to_datetime(values)
+
+
+def parse_category(values):
+    return values.astype("category")
+
+
+PARSERS = {
+    PERCENT: parse_percent,
+    NUMBER: parse_number,
+    DATE: parse_date,
+    CATEGORY: parse_category,
+}
+
+
+def apply(file_name, df):
+    df = df.rename(columns=clean_col)
+    columns = SCHEMAS.get(file_name, {})
+    parsed = {
+        col: PARSERS[kind](df[col])
+        for col, kind in columns.items()
+        if col in df.columns
+    }
+    if parsed:
+        df = df.assign(**parsed)
+    return df
+
+
+def fingerprint(file_name):
+    # Stored with snapshots so a schema edit invalidates them
+    return repr(sorted(SCHEMAS.get(file_name, {}).items()))
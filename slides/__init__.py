@@ -0,0 +1,95 @@
+import ast
+import importlib
+import os
+import threading
+
+import timing
+
+# Registry of the deck's slides. Each module in this package is one slide and
+# declares, as plain literals at the top:
+#
+#   TITLE     shown in the sidebar
+#   ORDER     position in the deck
+#   DATASETS  dataset names it reads (see datasets.DATASETS)
+#   DEFAULTS  ("module.function", args) calls that build what it shows before
+#             any widget is touched, for the warm-up and the prefetch
+#
+# and a render() that draws it. The declarations are read from the source
+# without importing anything, so the sidebar, the data loading report and the
+# warm-up know every slide while the slide modules themselves (and whatever
+# they pull in, e.g. matplotlib for the s8 chart) are only imported the first
+# time their slide is shown.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIELDS = ("TITLE", "ORDER", "DATASETS", "DEFAULTS")
+
+_lock = threading.Lock()
+_registry = []
+
+
+class Slide:
+    def __init__(self, module, title, order, datasets, defaults):
+        self.module = module
+        self.title = title
+        self.order = order
+        self.datasets = tuple(datasets)
+        self.defaults = tuple(defaults)
+
+    def load(self):
+        # The slide's module, imported on first use
+        with timing.stage("import", self.module):
+            return importlib.import_module(self.module)
+
+    def render(self):
+        self.load().render()
+
+    def calls(self):
+        # DEFAULTS as (function, args); imports the modules they name
+        return [(_function(name), tuple(args)) for name, args in self.defaults]
+
+
+def _function(name):
+    module, attr = name.rsplit(".", 1)
+    return getattr(importlib.import_module(module), attr)
+
+
+def _declarations(path):
+    # Literal values of FIELDS assigned at the top level of a module
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    found = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in FIELDS:
+                found[name] = ast.literal_eval(node.value)
+    return found
+
+
+def registry():
+    # Every slide, in deck order
+    with _lock:
+        if not _registry:
+            found = []
+            for file_name in sorted(os.listdir(HERE)):
+                if not file_name.endswith(".py") or file_name.startswith("_"):
+                    continue
+                fields = _declarations(os.path.join(HERE, file_name))
+                if "TITLE" not in fields:
+                    continue
+                found.append(Slide(
+                    f"{__name__}.{file_name[:-3]}",
+                    fields["TITLE"],
+                    fields.get("ORDER", 0),
+                    fields.get("DATASETS", ()),
+                    fields.get("DEFAULTS", ()),
+                ))
+            _registry.extend(sorted(found, key=lambda slide: slide.order))
+        return list(_registry)
+
+
+def get(title):
+    for slide in registry():
+        if slide.title == title:
+            return slide
+    raise KeyError(title)
@@ -0,0 +1,68 @@
+import streamlit as st
+
+import figures
+import timing
+from slides.ui import plotly_chart, slide_fragment
+
+TITLE = "Countries Leading the AI Revolution"
+ORDER = 4
+DATASETS = ("patents", "investment", "robots", "world", "china_usa")
+DEFAULTS = (
+    ("figures.country_default", ("AI Patent Applications",)),
+    ("figures.china_vs_usa", ()),
+)
+
+
+def render():
+    s2()
+    s2_1()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s2():
+    st.header("Countries Leading the AI Revolution")
+    st.subheader("Use the radio buttons below to switch between different global metrics related to AI and automation.")
+
+    s2_map()
+
+
+# Radio, slider and map rerun on their own when either widget changes
+@slide_fragment
+@timing.timed("slide")
+def s2_map():
+# --- Radio Button UI ---
+    dataset_choice = st.radio(
+        "Select dataset to view:",
+        ('AI Patent Applications', 'Private Investment in AI', 'Industrial Robots Installed')
+    )
+    scale = st.radio("Scale:", tuple(figures.COUNTRY_SCALES), horizontal=True)
+    scaled = figures.COUNTRY_SCALES[scale] is not None
+    if scaled:
+        st.caption("Every year is scaled by the 2023 population and GDP in world-data-2023.csv.")
+
+# --- Play every year in the browser instead of one year per slider move ---
+    if st.toggle("Scrub years in the browser"):
+        if scaled:
+            fig = figures.scaled_animation(dataset_choice, scale)
+        else:
+            fig = figures.country_animation(dataset_choice)
+        plotly_chart(fig, width="stretch", height=1000)
+        return
+
+    available_years = figures.country_years(dataset_choice, scale)
+    selected_year = st.slider("Select Year", int(min(available_years)), int(max(available_years)), int(max(available_years)))
+
+# --- Plot Heatmap ---
+    if scaled:
+        fig = figures.scaled_choropleth(dataset_choice, scale, selected_year)
+    else:
+        fig = figures.country_choropleth(dataset_choice, selected_year)
+    plotly_chart(fig, width="stretch", height=1000)
+###########################################################################################################################################
+@timing.timed("slide")
+def s2_1():
+    st.subheader("America has been dominating the global AI race, however China is quickly catching up.")
+
+    # Show in Streamlit
+    plotly_chart(figures.china_vs_usa(), width="stretch")
@@ -0,0 +1,37 @@
+import streamlit as st
+
+import figures
+import timing
+from slides.ui import plotly_chart
+
+TITLE = "AI Development and Prevalence"
+ORDER = 6
+DATASETS = ("rise_of_ai", "ai_vs_human")
+DEFAULTS = (
+    ("figures.ai_value", ()),
+    ("figures.ai_in_the_field", ()),
+    ("figures.ai_vs_human", ()),
+)
+
+
+def render():
+    s7()
+    s4()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s7():
+    st.subheader("With billions being funnelled into AI, many organizations are using AI and it continues to increase every year.")
+
+    plotly_chart(figures.ai_value())
+
+    plotly_chart(figures.ai_in_the_field())
+
+
+@timing.timed("slide")
+def s4():
+    st.subheader("From humble beginnings AI is slowly becoming better than its creators at tasks given to it. The dotted black line is a human baseline.")
+
+    # Display in Streamlit
+    plotly_chart(figures.ai_vs_human(), width="stretch")
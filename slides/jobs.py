@@ -0,0 +1,79 @@
+import streamlit as st
+
+import figures
+import jobindex
+import timing
+from slides.ui import plotly_chart, slide_fragment
+
+TITLE = "Jobs and Industries Most at Risk"
+ORDER = 2
+DATASETS = ("jobs",)
+DEFAULTS = (
+    ("figures.job_risk", (50, "Top 15 Most At-Risk")),
+    ("figures.domain_impact", ()),
+    ("jobindex.get", ()),
+)
+
+
+def render():
+    s6()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s6():
+    st.header("Who’s Most at Risk? AI Job Threat Index")
+
+    s6_risk()
+
+    # --- Chart: AI Impact by Industry Domain ---
+    st.subheader("Average AI Impact by Industry")
+    plotly_chart(figures.domain_impact(), width="stretch")
+
+    s6_lookup()
+
+
+# The threshold slider and view toggle only rerun the risk chart
+@slide_fragment
+@timing.timed("slide")
+def s6_risk():
+    # --- Slider to filter by AI Impact threshold ---
+    min_impact = st.slider("Minimum AI Impact to show (Risk Chart)", 0, 100, 50)
+
+    # --- Toggle: Top vs Bottom jobs ---
+    view_mode = st.radio(
+        "Choose job list view:",
+        ["Top 15 Most At-Risk", "Bottom 15 Least At-Risk"]
+    )
+
+    # --- Chart: Risk by Job Title ---
+    st.subheader("Job-Level AI Risk")
+    plotly_chart(figures.job_risk(min_impact, view_mode), width="stretch")
+
+
+# Typing a search or picking a job only reruns the lookup box
+@slide_fragment
+@timing.timed("slide")
+def s6_lookup():
+    # Impact-sorted rows, title lookup and domain averages for My_Data.csv
+    index = jobindex.get()
+
+    # --- Selectbox to Search Job ---
+    st.subheader("Look Up Your Job Title")
+    # Only the best matches for the typed text are sent to the browser
+    query = st.text_input("Search job titles:", placeholder="e.g. data analyst")
+    matches = index.search.search(query)
+    if not matches:
+        st.info(f"No job titles match \"{query}\".")
+        return
+    job_selected = st.selectbox("Select a job title:", matches)
+    job_row = index.lookup(job_selected)
+
+    st.markdown(f"""
+    **Job Title**: {job_row['Job_titiles']}  
+    **AI Impact**: {job_row['AI_Impact']}%  
+    **# of Tasks**: {job_row['Tasks']}  
+    **# of AI Models**: {job_row['AI_models']}  
+    **AI Workload Ratio**: {job_row['AI_Workload_Ratio']}  
+    **Domain**: {job_row['Domain']}
+    """)
@@ -0,0 +1,39 @@
+import streamlit as st
+
+import figures
+import timing
+from slides.ui import plotly_chart
+
+TITLE = "Layoffs and Workforce Dynamics"
+ORDER = 1
+DATASETS = ("layoffs", "employment")
+DEFAULTS = (
+    ("figures.layoffs_by_year", ()),
+    ("figures.fastest_growing", (10,)),
+    ("figures.employment_vs_growth", ()),
+)
+
+
+def render():
+    s1()
+    s1_1(10)
+    s1_2()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s1():
+    st.header("Layoffs and Workforce Dynamics")
+    st.subheader("Many country wide events have occured and have led to increased layoffs. Hovering over each bubble will show the event most correlated to the that years layoffs.")
+
+    # Show the plot
+    plotly_chart(figures.layoffs_by_year(), width="stretch")
+###########################################################################################################################################
+@timing.timed("slide")
+def s1_1(top_n):
+    st.subheader("Some jobs have seen immense growth despite the AI boom.")
+    plotly_chart(figures.fastest_growing(top_n), width="stretch")
+    ###########################################################################################################################################
+@timing.timed("slide")
+def s1_2():
+    plotly_chart(figures.employment_vs_growth(), width="stretch")
@@ -0,0 +1,48 @@
+import streamlit as st
+
+import figures
+import timing
+from slides.ui import image, plotly_chart, slide_fragment
+
+TITLE = "Annual Industrial Robots Installed"
+ORDER = 3
+DATASETS = ("robots", "rise_of_ai")
+DEFAULTS = (
+    ("figures.robots_installed", ()),
+    ("figures.org_adoption_png", ("Implementation & Adoption",)),
+)
+
+
+def render():
+    s3()
+    s8()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s3():
+    st.title("Annual Industrial Robots Installed Over Time by Entity")
+    st.subheader("China has been dominating the automation sector for many years and will continue to do so if predictions are true.")
+
+    # Render in Streamlit
+    plotly_chart(figures.robots_installed(), width="stretch")
+
+
+@timing.timed("slide")
+def s8():
+    st.subheader("Companies are deciding that it is time to move from human powered labor to mechanical labor.")
+    s8_chart()
+
+
+# Switching charts only reruns this block
+@slide_fragment
+@timing.timed("slide")
+def s8_chart():
+    # 2. UI selector
+    choice = st.radio(
+        "Choose a chart:",
+        ("Implementation & Adoption", "Expectation ")
+    )
+
+    # 3. Grouped bars or the expectation line, as cached PNG bytes
+    image(figures.org_adoption_png(choice))
@@ -0,0 +1,35 @@
+import streamlit as st
+
+import datasets
+import figures
+import timing
+from slides.ui import plotly_chart
+
+TITLE = "Key Events Timeline (U.S. vs China)"
+ORDER = 5
+DATASETS = ("timeline",)
+DEFAULTS = (
+    ("figures.events_timeline", ()),
+)
+
+
+def render():
+    s5()
+
+
+############################################################################################################################################################################
+@timing.timed("slide")
+def s5():
+    st.header("Key Events Timeline (U.S. vs China)")
+    st.subheader("Throughout the years many events have shaped the global stage for the battle between these two superpowers for AI and automation supremacy. Hover over each block or click the drop down menus to see the biggest events.")
+    plotly_chart(figures.events_timeline(), width="stretch")
+
+    # === Narrative Breakdown ===
+    st.subheader("Event Breakdown")
+    for _, row in datasets.get("timeline").iterrows():
+        with st.expander(f"{int(row['Year'])} – {row['Country']}: {row['Event']}"):
+            st.markdown(f"""
+            - **Type**: {row['Type']}
+            - **Impact**: {row['Impact']}
+            - **Description**: {row['Description']}
+            """)
@@ -0,0 +1,47 @@
+import contextlib
+import functools
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import datasets
+import figcache
+import metrics
+import timing
+
+# Streamlit wrappers shared by the slide modules. Figures come from
+# figures.py and are shared across sessions through the figure cache; the
+# slides only lay out their widgets and hand the figures to these.
+
+
+def plotly_chart(fig, **kwargs):
+    # st.plotly_chart, timed as the figure's serialization stage
+    with timing.stage("serialize", "plotly_chart"):
+        st.plotly_chart(fig, **kwargs)
+    if timing.tracing():
+        timing.payload("plotly_chart", *figcache.payload_bytes(fig))
+
+
+def image(png, **kwargs):
+    # st.image for the cached PNG charts, full width like st.pyplot
+    with timing.stage("serialize", "image"):
+        st.image(png, width="stretch", **kwargs)
+    if timing.tracing():
+        timing.payload("image", len(png))
+
+
+def slide_fragment(render):
+    # st.fragment whose reruns still attribute dataset loads to the slide, and
+    # are counted in the metrics when the fragment reruns on its own. Outside
+    # the deck (stack.py, ...) there is no current slide to attribute them to.
+    @functools.wraps(render)
+    def run(*args, **kwargs):
+        slide = st.session_state.get("current_slide")
+        ctx = get_script_run_ctx()
+        if slide is not None and ctx is not None and ctx.fragment_ids_this_run:
+            counted = metrics.rerun(slide, "fragment")
+        else:
+            counted = contextlib.nullcontext()
+        with counted, datasets.loading_for(slide):
+            return render(*args, **kwargs)
+    return st.fragment(run)
@@ -0,0 +1,110 @@
+import contextlib
+import functools
+import threading
+import time
+from collections import defaultdict
+
+# Stage timers shared by the registry, the figure cache and the slide code.
+#
+#   with timing.stage("load", "jobs"):
+#       ...
+#
+# Stages used in the deck:
+#   import     importing a slide's modules (and matplotlib) on first use
+#   load       reading a snapshot, CSV, SQLite table or disk cache entry
+#   clean      schema parsing and per-file cleaning
+#   figure     building a figure on a cache miss
+#   serialize  turning figures into what is sent to the browser
+#   slide      a whole slide function
+#
+# Stages nest (a figure build loads its dataset, a slide builds figures), so
+# each run records both its wall time ("ms") and its self time ("self_ms"):
+# the wall time minus that of the stages run inside it. Self times don't
+# overlap, so they split a rerun between the stages.
+#
+# Process-wide totals are kept per stage; bench.py resets and reads them
+# around each run. Inside `with timing.trace() as events:` every stage run by
+# the thread is also listed in order, with its label and nesting depth, for
+# the perf panel in the sidebar.
+
+_lock = threading.Lock()
+_totals = defaultdict(lambda: {"count": 0, "ms": 0.0, "self_ms": 0.0})
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def stage(name, label=None):
+    events = getattr(_local, "events", None)
+    if events is not None:
+        event = {"stage": name, "label": label, "depth": _local.depth, "ms": 0.0, "self_ms": 0.0}
+        events.append(event)
+        _local.depth += 1
+    # Wall time of the stages run inside this one, per open stage
+    children = getattr(_local, "children", None)
+    if children is None:
+        children = _local.children = []
+    children.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        self_ms = ms - children.pop()
+        if children:
+            children[-1] += ms
+        record(name, label, ms, self_ms)
+        if events is not None:
+            event["ms"], event["self_ms"] = ms, self_ms
+            _local.depth -= 1
+
+
+def timed(name, label=None):
+    # Decorator form of stage(), labelled with the function name by default
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name, label or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def trace():
+    previous = getattr(_local, "events", None), getattr(_local, "depth", 0)
+    events = []
+    _local.events, _local.depth = events, 0
+    try:
+        yield events
+    finally:
+        _local.events, _local.depth = previous
+
+
+def tracing():
+    return getattr(_local, "events", None) is not None
+
+
+def payload(label, size, raw_size=None):
+    # Bytes handed to the browser for one element (and before any compaction);
+    # only kept while tracing
+    events = getattr(_local, "events", None)
+    if events is not None:
+        events.append({"stage": "payload", "label": label, "depth": _local.depth, "bytes": size, "raw_bytes": raw_size})
+
+
+def record(name, label, ms, self_ms=None):
+    with _lock:
+        total = _totals[name]
+        total["count"] += 1
+        total["ms"] += ms
+        total["self_ms"] += ms if self_ms is None else self_ms
+
+
+def totals():
+    with _lock:
+        return {name: dict(total) for name, total in _totals.items()}
+
+
+def reset():
+    with _lock:
+        _totals.clear()
@@ -0,0 +1,201 @@
+import logging
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from streamlit.elements.lib.streamlit_plotly_theme import configure_streamlit_plotly_theme
+
+import database
+import datasets
+import figcache
+
+# Server-start warm-up: every slide's datasets and default figures are put in
+# the shared caches before (or while) the first visitor arrives.
+#
+# Figures with a @cached builder are built in a pool of worker processes and
+# come back as figure JSON, which is stored in the figure cache under the key
+# the builder would use here. Meanwhile this process loads every dataset into
+# the registry and runs the rest of the table (composite calls, indexes).
+#
+# The pool lives in a helper process (this file run as a script) rather than
+# in the server: Streamlit runs the app as __main__, so workers spawned from
+# the server would import groupapp.py and run the whole deck again. The
+# helper loads the data once and forks its workers where fork is available.
+# Starting it costs a Python start-up plus the pandas/plotly imports per
+# process, which measured slower than building the handful of default
+# figures here (3.4 s vs 1.2 s), so by default everything is built in this
+# process and the pool is opt-in. A helper that fails, or doesn't answer
+# within HELPER_TIMEOUT, is killed and its figures are left to be built on
+# first use.
+#
+#   DECK_WARMUP=0            skip it
+#   DECK_WARMUP_WORKERS=n    build in a pool of n worker processes (default 1: no pool)
+
+ENABLED = os.environ.get("DECK_WARMUP", "1") != "0"
+WORKERS = int(os.environ.get("DECK_WARMUP_WORKERS", "1"))
+HELPER_TIMEOUT = 300
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {"thread": None, "report": None}
+
+
+def _build(task):
+    # In a worker process: run the bare builder (no point caching it there).
+    # Returns figure JSON, or the PNG bytes of a matplotlib chart
+    import figures
+
+    name, args = task
+    fig = getattr(figures, name).__wrapped__(*args)
+    return fig if isinstance(fig, bytes) else figcache.serialize(fig)[1]
+
+
+def build_all(tasks, workers):
+    # In the helper process: {(builder name, args): figure JSON or None}.
+    # Streamlit sets its own default Plotly template when imported; the
+    # server's figures are built with it, so these must be too.
+    configure_streamlit_plotly_theme()
+    # Imported before forking, so the workers start with it
+    import figures  # noqa: F401
+    for name in datasets.DATASETS:
+        database.prepare(name)
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+        futures = {task: pool.submit(_build, task) for task in tasks}
+    results = {}
+    for task, future in futures.items():
+        try:
+            results[task] = future.result()
+        except Exception:
+            log.exception("warm-up of %s%r failed", *task)
+            results[task] = None
+    return results
+
+
+def load_all(slide_datasets):
+    for title, names in slide_datasets.items():
+        with datasets.loading_for(title):
+            for name in names:
+                database.prepare(name)
+
+
+def run(slide_datasets, slide_figures, workers=WORKERS):
+    # slide_figures() gives {slide title: [(function, args)]}; it is called
+    # here so the figure modules are imported in this thread
+    start = time.perf_counter()
+    calls = [call for calls in slide_figures().values() for call in calls]
+    if workers > 1:
+        failed = _run_in_pool(slide_datasets, calls, workers)
+    else:
+        load_all(slide_datasets)
+        failed = _run_here(calls)
+
+    # Only figure builders count as figures (not e.g. jobindex.get)
+    built = [(fn, args) for fn, args in calls if fn.__module__ == "figures" and (fn, args) not in failed]
+    report = {
+        "seconds": time.perf_counter() - start,
+        "figures": len(built),
+        "failed": len(failed),
+        "workers": workers,
+    }
+    log.info("warm-up: %(figures)d figures in %(seconds).2f s with %(workers)d workers", report)
+    _state["report"] = report
+    return report
+
+
+def _run_here(calls):
+    # The calls that failed
+    failed = []
+    for fn, args in calls:
+        try:
+            fn(*args)
+        except Exception:
+            failed.append((fn, args))
+            log.exception("warm-up of %s%r failed", fn.__name__, args)
+    return failed
+
+
+def _run_in_pool(slide_datasets, calls, workers):
+    # Figures kept on disk from an earlier run are only read back
+    in_workers = [
+        (fn, args) for fn, args in calls
+        if hasattr(fn, "key") and figcache.restore(fn.key(*args), fn.datasets(*args)) is None
+    ]
+    here = [(fn, args) for fn, args in calls if not hasattr(fn, "key")]
+
+    if not in_workers:
+        load_all(slide_datasets)
+        return _run_here(here)
+
+    helper = None
+    try:
+        helper = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(workers)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        # Tasks go in first, so the helper works while this process loads
+        helper.stdin.write(pickle.dumps([(fn.__name__, args) for fn, args in in_workers]))
+        helper.stdin.close()
+        # Already sent: communicate() below only reads the results
+        helper.stdin = None
+    except Exception:
+        log.exception("warm-up helper could not be started")
+
+    results = {}
+    # Until they have run
+    failed = list(here)
+    try:
+        load_all(slide_datasets)
+        failed = _run_here(here)
+        if helper is not None:
+            output, _ = helper.communicate(timeout=HELPER_TIMEOUT)
+            if helper.returncode == 0:
+                results = pickle.loads(output)
+            else:
+                log.warning("warm-up helper exited with status %s", helper.returncode)
+    except Exception:
+        log.exception("warm-up helper failed; its figures are built on first use")
+    finally:
+        if helper is not None:
+            if helper.poll() is None:
+                helper.kill()
+            helper.wait()
+
+    for fn, args in in_workers:
+        text = results.get((fn.__name__, args))
+        if text is None:
+            failed.append((fn, args))
+        else:
+            figcache.put(fn.key(*args), text, fn.datasets(*args))
+    return failed
+
+
+def start(slide_datasets, slide_figures):
+    # Called on every script run; the first one starts the warm-up in a
+    # background thread so that visitor's page isn't held up by it
+    if not ENABLED:
+        return
+    with _lock:
+        if _state["thread"] is not None:
+            return
+        _state["thread"] = threading.Thread(
+            target=run, args=(slide_datasets, slide_figures), name="deck-warmup", daemon=True
+        )
+    _state["thread"].start()
+
+
+def report():
+    # None until the warm-up has finished
+    return _state["report"]
+
+
+if __name__ == "__main__":
+    # Helper process for _run_in_pool: tasks in on stdin, results out on stdout
+    tasks = pickle.load(sys.stdin.buffer)
+    pickle.dump(build_all(tasks, int(sys.argv[1])), sys.stdout.buffer)
@@ -0,0 +1,100 @@
+import logging
+import os
+import threading
+import time
+
+import database
+import datasets
+import figcache
+
+# Hot reload of the CSVs next to the app. A background thread polls the files
+# behind the loaded datasets every INTERVAL seconds; when one changes it
+# parses just that file again (datasets.reload, or database.reload for the
+# datasets kept in SQLite; either moves the dataset to a new version) and
+# drops the cached figures built from the old version (figcache.invalidate).
+# Other datasets, their figures and everything derived from them stay as they
+# are.
+#
+# A file is only reloaded once its mtime and size have held still for one
+# whole poll, so a CSV that is still being copied in isn't parsed half way.
+# Datasets nobody has loaded yet need nothing: their first get() reads the
+# current file anyway. While the watcher runs, sessions no longer check the
+# files themselves (see datasets.use_watcher). A file that fails to parse is
+# logged once and left alone until it changes again.
+#
+#   DECK_WATCH=0             turn it off (files are then still picked up, by
+#                            the next get() after datasets.CHECK_INTERVAL)
+#   DECK_WATCH_INTERVAL=s    seconds between polls (default 2)
+
+ENABLED = os.environ.get("DECK_WATCH", "1") != "0"
+INTERVAL = float(os.environ.get("DECK_WATCH_INTERVAL", "2"))
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {"thread": None, "reloads": []}
+# name -> stamp of a file that failed to reload
+_failed = {}
+
+
+def poll(pending):
+    # One pass: reload the datasets whose changed file was already seen with
+    # the same stamp last time. `pending` carries {name: stamp} between passes.
+    reloaded = []
+    changed = datasets.changed()
+    for name, stamp in changed.items():
+        if _failed.get(name) == stamp:
+            continue
+        if pending.get(name) != stamp:
+            # Changed since the last pass, maybe still being written
+            pending[name] = stamp
+            continue
+        del pending[name]
+        start = time.perf_counter()
+        try:
+            with datasets.loading_for("file watcher"):
+                if name in database.TABLES:
+                    database.reload(name)
+                else:
+                    datasets.reload(name)
+        except Exception:
+            log.exception("reloading %s failed; keeping the version already loaded", name)
+            _failed[name] = stamp
+            continue
+        _failed.pop(name, None)
+        dropped = figcache.invalidate(name)
+        record = {"name": name, "figures": dropped, "ms": (time.perf_counter() - start) * 1000, "at": time.time()}
+        _state["reloads"].append(record)
+        log.info("reloaded %(name)s in %(ms).1f ms, dropped %(figures)d cached figures", record)
+        reloaded.append(name)
+    # Files that went back to what is loaded
+    for name in list(pending):
+        if name not in changed:
+            del pending[name]
+    return reloaded
+
+
+def _run():
+    pending = {}
+    while True:
+        time.sleep(INTERVAL)
+        try:
+            poll(pending)
+        except Exception:
+            log.exception("file watcher pass failed")
+
+
+def start():
+    # Called on every script run; only the first one starts the thread
+    if not ENABLED:
+        return
+    with _lock:
+        if _state["thread"] is not None:
+            return
+        _state["thread"] = threading.Thread(target=_run, name="deck-watcher", daemon=True)
+    datasets.use_watcher()
+    _state["thread"].start()
+
+
+def reloads():
+    return list(_state["reloads"])